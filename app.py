@@ -1,8 +1,6 @@
 import streamlit as st
-import sqlite3
-from passlib.hash import bcrypt
-from datetime import datetime
-import time
+from cls_core import auth
+from cls_core.db import migrate
 
 # =============================
 # PAGE CONFIGURATION
@@ -12,62 +10,14 @@ st.set_page_config(page_title="Contract Simplifier", page_icon="📘", layout="w
 # =============================
 # DATABASE SETUP
 # =============================
-DB_PATH = "cls_app.db"
-
-def get_conn():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
-
-def init_db():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            created_at TEXT NOT NULL
-        );
-    """)
-    conn.commit()
-    conn.close()
-
-init_db()
+# Pooled WAL connections; the users schema lives in cls_core.db.MIGRATIONS
+migrate()
 
 # =============================
 # UTILITY FUNCTIONS
 # =============================
-def create_user(name, email, password):
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        cur.execute("INSERT INTO users (name, email, password_hash, created_at) VALUES (?, ?, ?, ?)",
-                    (name, email, bcrypt.hash(password), datetime.utcnow().isoformat()))
-        conn.commit()
-        return True, None
-    except sqlite3.IntegrityError:
-        return False, "Email already exists."
-    finally:
-        conn.close()
-
-def verify_user(email, password):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT id, name, email, password_hash FROM users WHERE email=?", (email,))
-    user = cur.fetchone()
-    conn.close()
-    if user and bcrypt.verify(password, user[3]):
-        return {"id": user[0], "name": user[1], "email": user[2]}
-    return None
-
-def reset_password(email, new_password):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("UPDATE users SET password_hash=? WHERE email=?", (bcrypt.hash(new_password), email))
-    conn.commit()
-    conn.close()
+# create_user / login / reset_password live in cls_core.auth: bcrypt runs in its
+# bounded worker pool, not in this script thread.
 
 # =============================
 # PAGE STYLING
@@ -103,12 +53,32 @@ st.markdown("""
 if "page" not in st.session_state:
     st.session_state.page = "login"
 
+# A verified session token skips the login form on reruns without re-checking the password.
+session_user = auth.session_user(st.session_state.get("auth_token"))
+if session_user is None:
+    st.session_state.pop("user", None)
+
 st.markdown("<div class='header'>Contract Language Simplifier</div>", unsafe_allow_html=True)
 st.markdown("<div class='subtext'>Simplify legal contracts using AI — Log in to continue.</div>", unsafe_allow_html=True)
 
 st.markdown("<div class='card'>", unsafe_allow_html=True)
 
-if st.session_state.page == "login":
+if "flash" in st.session_state:
+    st.success(st.session_state.pop("flash"))
+
+if session_user is not None:
+    st.subheader(f"Signed in as {session_user['name']}")
+    c1, c2 = st.columns(2)
+    with c1:
+        if st.button("Continue"):
+            st.switch_page("pages/1_Simplify.py")
+    with c2:
+        if st.button("Log Out"):
+            auth.logout(st.session_state.pop("auth_token"))
+            st.session_state.pop("user", None)
+            st.rerun()
+
+elif st.session_state.page == "login":
     st.subheader("Sign In")
     email = st.text_input("Email")
     password = st.text_input("Password", type="password")
@@ -116,11 +86,10 @@ if st.session_state.page == "login":
     c1, c2 = st.columns(2)
     with c1:
         if st.button("Login"):
-            user = verify_user(email, password)
+            user, token = auth.login(email, password)
             if user:
                 st.session_state.user = user
-                st.success(f"Welcome {user['name']}!")
-                time.sleep(1)
+                st.session_state.auth_token = token
                 st.switch_page("pages/1_Simplify.py")
             else:
                 st.error("Invalid email or password.")
@@ -146,10 +115,9 @@ elif st.session_state.page == "signup":
         elif password != confirm:
             st.error("Passwords do not match.")
         else:
-            ok, msg = create_user(name, email, password)
+            ok, msg = auth.create_user(name, email, password)
             if ok:
-                st.success("Account created successfully! Please log in.")
-                time.sleep(1)
+                st.session_state.flash = "Account created successfully! Please log in."
                 st.session_state.page = "login"
                 st.rerun()
             else:
@@ -171,9 +139,8 @@ elif st.session_state.page == "forgot":
         elif new_password != confirm_password:
             st.error("Passwords do not match.")
         else:
-            reset_password(email, new_password)
-            st.success("Password reset successfully! Please log in.")
-            time.sleep(1)
+            auth.reset_password(email, new_password)
+            st.session_state.flash = "Password reset successfully! Please log in."
             st.session_state.page = "login"
             st.rerun()
 
@@ -0,0 +1,109 @@
+"""Login storm: p50/p99 latency of bcrypt in every session thread vs cls_core.auth.
+
+Scenarios, each with --sessions concurrent threads logging in --logins times:
+  inline   passlib verify in the calling thread (what app.py used to do)
+  service  cls_core.auth.login: verification in the bounded CLS_AUTH_WORKERS pool
+  rerun    cls_core.auth.session_user(token): what a page rerun costs after login
+
+With --seed-rounds lower than CLS_BCRYPT_ROUNDS, the report also shows how
+many stored hashes the service upgraded on login.
+
+Usage:
+    CLS_BCRYPT_ROUNDS=10 python benchmarks/bench_auth.py --users 50 --sessions 32 --logins 4
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PASSWORD = "correct horse battery staple"
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[max(int(len(values) * pct) - 1, 0)]
+
+
+def storm(sessions, logins, fn):
+    latencies = []
+    lock = threading.Lock()
+
+    def session(i):
+        local = []
+        for n in range(logins):
+            start = time.perf_counter()
+            fn(i, n)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+
+def report(name, latencies, elapsed):
+    print(f"{name:<8} {len(latencies) / elapsed:9.1f} logins/s  p50 {statistics.median(latencies) * 1000:9.3f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=32, help="concurrent login threads")
+    parser.add_argument("--logins", type=int, default=4, help="logins per session")
+    parser.add_argument("--seed-rounds", type=int, help="bcrypt rounds of the stored hashes (default: CLS_BCRYPT_ROUNDS)")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["CLS_DB_PATH"] = os.path.join(tmp, "auth.db")
+    from passlib.hash import bcrypt
+    from cls_core import auth, db
+
+    db.migrate()
+    seed_rounds = args.seed_rounds or auth.ROUNDS
+    stored = bcrypt.using(rounds=seed_rounds).hash(PASSWORD)
+    conn = db.get_conn()
+    conn.executemany("INSERT INTO users (name, email, password_hash, created_at) VALUES (?, ?, ?, ?)",
+                     [(f"user{i}", f"user{i}@example.com", stored, "2024-01-01") for i in range(args.users)])
+    conn.commit()
+    conn.close()
+
+    def email(i):
+        return f"user{i % args.users}@example.com"
+
+    print(f"{args.sessions} sessions x {args.logins} logins, bcrypt rounds {auth.ROUNDS} "
+          f"(stored {seed_rounds}), {auth.MAX_WORKERS} auth workers, {os.cpu_count()} CPUs")
+
+    report("inline", *storm(args.sessions, args.logins, lambda i, n: bcrypt.verify(PASSWORD, stored)))
+
+    tokens = {}
+
+    def service(i, n):
+        user, tokens[i] = auth.login(email(i), PASSWORD)
+        assert user is not None
+
+    report("service", *storm(args.sessions, args.logins, service))
+    report("rerun", *storm(args.sessions, args.logins * 1000, lambda i, n: auth.session_user(tokens[i])))
+
+    if seed_rounds != auth.ROUNDS:
+        conn = db.get_conn()
+        upgraded = conn.execute("SELECT COUNT(*) FROM users WHERE password_hash != ?", (stored,)).fetchone()[0]
+        conn.close()
+        print(f"rehashed on login: {upgraded}/{args.users} users ({seed_rounds} -> {auth.ROUNDS} rounds)")
+    db.pool.close_all()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compare torch fp32, dynamic int8 and ONNX Runtime backends on CPU.
+
+Each backend runs in its own process so resident memory is measured in
+isolation. Reported per backend: load time, RSS added by loading, single
+sentence latency (p50/p99), batched throughput, and parity against the
+torch outputs on cls_core.backends.PARITY_SENTENCES.
+
+Usage:
+    python benchmarks/bench_backends.py --model t5-base --backends torch,int8,onnx --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cls_core.backends import BACKENDS, PARITY_SENTENCES, parity_check  # noqa: E402
+
+
+def run_backend(model_id, backend, repeat, max_length):
+    """Child process: load one backend, time it and print a JSON result."""
+    import time
+
+    from cls_core import backends
+    from cls_core.batching import simplify_batched
+    from cls_core.registry import current_rss
+
+    gen = {"max_length": max_length, "do_sample": False}
+    rss_before = current_rss()
+    start = time.perf_counter()
+    model = backends.load(model_id, backend=backend)
+    load_s = time.perf_counter() - start
+    rss_mb = (current_rss() - rss_before) / 2**20
+
+    outputs = simplify_batched(model, PARITY_SENTENCES, **gen)  # also warms up kernels
+
+    latencies = []
+    for _ in range(repeat):
+        for sentence in PARITY_SENTENCES:
+            start = time.perf_counter()
+            simplify_batched(model, [sentence], **gen)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    corpus = PARITY_SENTENCES * repeat
+    start = time.perf_counter()
+    simplify_batched(model, corpus, **gen)
+    throughput = len(corpus) / (time.perf_counter() - start)
+
+    print(json.dumps({
+        "backend": backend, "load_s": load_s, "rss_mb": rss_mb,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000,
+        "sentences_per_s": throughput, "outputs": outputs,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="t5-base")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-length", type=int, default=100)
+    parser.add_argument("--show-diffs", action="store_true", help="print every output that differs from torch's")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_backend(args.model, args.child, args.repeat, args.max_length)
+        return
+
+    results = []
+    for backend in args.backends.split(","):
+        proc = subprocess.run([sys.executable, __file__, "--model", args.model, "--repeat", str(args.repeat),
+                               "--max-length", str(args.max_length), "--child", backend],
+                              capture_output=True, text=True)
+        if proc.returncode:
+            print(f"{backend}: failed\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    reference = next((r["outputs"] for r in results if r["backend"] == "torch"), None)
+    print(f"{args.model}: {len(PARITY_SENTENCES)} sentences x {args.repeat}")
+    print(f"{'backend':<8} {'load s':>7} {'RSS MB':>8} {'p50 ms':>8} {'p99 ms':>8} {'sent/s':>7} {'exact':>6} {'similar':>8}")
+    diffs = {}
+    for r in results:
+        exact = similar = float("nan")
+        if reference:
+            parity = parity_check(reference, r["outputs"])
+            exact, similar = parity["exact_match"], parity["mean_similarity"]
+            diffs[r["backend"]] = parity["diffs"]
+        print(f"{r['backend']:<8} {r['load_s']:7.1f} {r['rss_mb']:8.0f} {r['p50_ms']:8.1f} {r['p99_ms']:8.1f} "
+              f"{r['sentences_per_s']:7.1f} {exact:6.0%} {similar:8.3f}")
+    if args.show_diffs:
+        for backend, rows in diffs.items():
+            for row in rows:
+                print(f"\n[{backend}] {row['source']}\n  torch: {row['reference']}\n  {backend}: {row['candidate']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare per-sentence simplification against length-bucketed batching on CPU.
+
+Usage:
+    python benchmarks/bench_batching.py --sentences 64 --batch-size 16
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cls_core.batching import simplify_batched  # noqa: E402
+
+CLAUSES = [
+    "This Agreement shall be governed by and construed in accordance with the laws of the State of New York.",
+    "Notwithstanding the foregoing, neither party shall be liable for any indirect or consequential damages.",
+    "The Supplier shall indemnify the Customer against all losses arising from a breach of this clause.",
+    "Either party may terminate this Agreement upon thirty days written notice.",
+    "Confidential Information does not include information that is or becomes publicly available through no fault of the Recipient.",
+    "Payment is due within forty-five days of receipt of a valid invoice.",
+    "Any amendment to this Agreement must be in writing and signed by authorised representatives of both parties, "
+    "and no course of dealing shall operate as a waiver of any right hereunder.",
+    "Fees are exclusive of taxes.",
+]
+
+
+def build_corpus(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.choice(CLAUSES) for _ in range(n)]
+
+
+def run_loop(model, sentences, max_length):
+    return [model(s, max_length=max_length, num_return_sequences=1)[0]["generated_text"] for s in sentences]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="tuner007/pegasus_paraphrase")
+    parser.add_argument("--sentences", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-tokens", type=int, default=2048)
+    parser.add_argument("--max-length", type=int, default=100)
+    args = parser.parse_args()
+
+    from transformers import pipeline
+
+    model = pipeline("text2text-generation", model=args.model, device=-1)
+    sentences = build_corpus(args.sentences)
+    run_loop(model, sentences[:2], args.max_length)  # warm-up
+
+    start = time.perf_counter()
+    run_loop(model, sentences, args.max_length)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simplify_batched(model, sentences, batch_size=args.batch_size, max_tokens=args.max_tokens,
+                     max_length=args.max_length, num_return_sequences=1)
+    batched_s = time.perf_counter() - start
+
+    print(f"model:       {args.model}")
+    print(f"sentences:   {len(sentences)}")
+    print(f"loop:        {len(sentences) / loop_s:8.2f} sentences/sec ({loop_s:.2f}s)")
+    print(f"batched:     {len(sentences) / batched_s:8.2f} sentences/sec ({batched_s:.2f}s)")
+    print(f"speedup:     {loop_s / batched_s:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Concurrent login load against cls_app.db: one-connection-per-call vs the pooled WAL connections.
+
+Each simulated user looks up their row (verify_user) and every --write-every
+logins also updates their password hash (reset_password). Password hashing
+is left out so the numbers reflect only the database layer.
+
+Usage:
+    python benchmarks/bench_db.py --users 500 --threads 16 --logins 4000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cls_core import db  # noqa: E402
+
+HASH = "$2b$12$" + "x" * 53
+
+
+def legacy_conn(path):
+    # What app.py did before: a fresh connection per call, default rollback journal.
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+def seed(conn, users):
+    conn.execute(db.MIGRATIONS[0][1])
+    now = datetime.utcnow().isoformat()
+    conn.executemany("INSERT INTO users (name, email, password_hash, created_at) VALUES (?, ?, ?, ?)",
+                     [(f"user{i}", f"user{i}@example.com", HASH, now) for i in range(users)])
+    conn.commit()
+    conn.close()
+
+
+def login(get_conn, email, write):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT id, name, email, password_hash FROM users WHERE email=?", (email,))
+    cur.fetchone()
+    conn.close()
+    if write:
+        conn = get_conn()
+        conn.execute("UPDATE users SET password_hash=? WHERE email=?", (HASH, email))
+        conn.commit()
+        conn.close()
+
+
+def run(get_conn, users, threads, logins, write_every):
+    latencies, errors = [], []
+    per_thread = logins // threads
+
+    def worker(seed_):
+        rng = random.Random(seed_)
+        local = []
+        for n in range(per_thread):
+            start = time.perf_counter()
+            try:
+                login(get_conn, f"user{rng.randrange(users)}@example.com", write_every and n % write_every == 0)
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+            local.append(time.perf_counter() - start)
+        latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "logins_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=4000)
+    parser.add_argument("--write-every", type=int, default=10, help="every Nth login also writes (0: read-only)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        seed(legacy_conn(legacy_path), args.users)
+        legacy = run(lambda: legacy_conn(legacy_path), args.users, args.threads, args.logins, args.write_every)
+
+        pool = db.ConnectionPool(os.path.join(tmp, "pooled.db"))
+        seed(pool.acquire(), args.users)
+        pooled = run(pool.acquire, args.users, args.threads, args.logins, args.write_every)
+        pool.close_all()
+
+    print(f"{args.threads} threads, {args.logins} logins, 1 write per {args.write_every or '∞'} logins")
+    for name, r in (("connect per call", legacy), ("pooled WAL", pooled)):
+        print(f"{name:<17} {r['logins_per_s']:8.0f} logins/s  p50 {r['p50_ms']:6.2f} ms  "
+              f"p99 {r['p99_ms']:7.2f} ms  errors {r['errors']}")
+    print(f"speedup: {pooled['logins_per_s'] / legacy['logins_per_s']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Measure streaming extraction throughput and peak memory on a long synthetic PDF.
+
+Usage:
+    python benchmarks/bench_extract.py --pages 500
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import make_pdf  # noqa: E402
+from cls_core.extract import iter_pages  # noqa: E402
+
+PAGE_LINES = [
+    "{n}. The Supplier shall deliver the Services in accordance with Schedule {n}.",
+    "Notwithstanding the foregoing, neither party shall be liable for indirect loss.",
+    "This Agreement shall be governed by the laws of England and Wales.",
+    "Either party may terminate this Agreement on thirty (30) days written notice.",
+] * 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    args = parser.parse_args()
+
+    data = make_pdf([[line.format(n=p) for line in PAGE_LINES] for p in range(1, args.pages + 1)])
+    tracemalloc.start()
+    start = time.perf_counter()
+    chars = 0
+    peaks = []
+    for i, page in enumerate(iter_pages(io.BytesIO(data), name="bench.pdf"), start=1):
+        chars += len(page)
+        if i % 50 == 0:
+            peaks.append(tracemalloc.get_traced_memory()[1] / 2**20)
+            tracemalloc.reset_peak()
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    print(f"pages:        {args.pages} ({len(data) / 2**20:.1f} MB PDF)")
+    print(f"throughput:   {args.pages / elapsed:.1f} pages/sec ({chars} chars in {elapsed:.2f}s)")
+    print("peak MB per 50 pages: " + ", ".join(f"{p:.1f}" for p in peaks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Time the original clean_text against cls_core.preprocess on a ~1 MB contract.
+
+The original implementation re-reads the stopword list for every token, so it
+is timed on a slice of the document and extrapolated linearly.
+
+Usage:
+    python benchmarks/bench_preprocess.py --size-mb 1 --baseline-slice-kb 50
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cls_core.preprocess import clean_many, clean_text  # noqa: E402
+
+PARAGRAPH = (
+    "1.{n} The Supplier shall, at its own cost, indemnify and hold harmless the Customer from and against "
+    "any and all claims, losses, liabilities, damages, costs and expenses (including reasonable legal fees) "
+    "arising out of or in connection with any breach of this Agreement by the Supplier. Notwithstanding the "
+    "foregoing, neither party shall be liable for any indirect, special or consequential loss.\n\n"
+)
+
+
+def original_clean_text(text):
+    from nltk.corpus import stopwords
+    from nltk.tokenize import word_tokenize
+
+    text = text.lower()
+    text = re.sub(r"[^a-zA-Z0-9\s]", "", text)
+    tokens = word_tokenize(text)
+    tokens = [w for w in tokens if w not in stopwords.words("english")]
+    return " ".join(tokens)
+
+
+def build_contract(size_bytes):
+    parts, total, n = [], 0, 0
+    while total < size_bytes:
+        n += 1
+        part = PARAGRAPH.format(n=n)
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--baseline-slice-kb", type=int, default=50)
+    parser.add_argument("--spacy", action="store_true", help="also time the spaCy tokenizer path")
+    args = parser.parse_args()
+
+    contract = build_contract(int(args.size_mb * 2**20))
+    sliced = contract[:args.baseline_slice_kb * 1024]
+
+    clean_text("warm up the stopword set")
+    _, slice_s = timed(original_clean_text, sliced)
+    baseline_s = slice_s * len(contract) / len(sliced)
+    cleaned, new_s = timed(clean_text, contract)
+    assert cleaned.startswith(original_clean_text(sliced)[:200])
+
+    print(f"document:            {len(contract) / 2**20:.2f} MB")
+    print(f"original clean_text: {baseline_s:8.2f}s (extrapolated from {args.baseline_slice_kb} KB in {slice_s:.2f}s)")
+    print(f"preprocess (nltk):   {new_s:8.2f}s  speedup {baseline_s / new_s:.0f}x")
+
+    docs = [contract[i:i + 20000] for i in range(0, len(contract), 20000)]
+    _, batch_s = timed(clean_many, docs)
+    print(f"clean_many x{len(docs):<4}      {batch_s:8.2f}s")
+
+    if args.spacy:
+        import spacy
+        nlp = spacy.load("en_core_web_sm")
+        _, spacy_s = timed(clean_many, docs, nlp)
+        print(f"clean_many (spaCy):  {spacy_s:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measure cold-start and warm-rerun cost of the page bootstrap in a fresh process.
+
+Each run starts a new interpreter, imports what a page imports, calls
+bootstrap.ensure() once cold and then --reruns times warm, and reports
+whether torch/transformers were imported along the way. --legacy also times
+the three nltk.download() calls each Text Analysis rerun used to make.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 3 --reruns 200 --legacy
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+from cls_core import bootstrap, extract, glossary, pipeline, readability, telemetry
+import_ms = (time.perf_counter() - t0) * 1000
+t0 = time.perf_counter()
+problems = bootstrap.ensure()
+cold_ms = (time.perf_counter() - t0) * 1000
+warm = []
+for _ in range({reruns}):
+    t0 = time.perf_counter()
+    bootstrap.ensure()
+    warm.append((time.perf_counter() - t0) * 1000)
+legacy_ms = None
+if {legacy}:
+    import nltk
+    t0 = time.perf_counter()
+    for name in ("punkt", "punkt_tab", "stopwords"):
+        nltk.download(name, quiet=True)
+    legacy_ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({{
+    "import_ms": import_ms, "cold_ms": cold_ms, "warm_ms": sorted(warm), "legacy_rerun_ms": legacy_ms,
+    "problems": problems, "heavy_imported": sorted(m for m in ("torch", "transformers", "spacy") if m in sys.modules),
+}}))
+"""
+
+
+def run_child(reruns, legacy, env):
+    code = CHILD.format(root=ROOT, reruns=reruns, legacy=legacy)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes to start")
+    parser.add_argument("--reruns", type=int, default=200, help="warm ensure() calls per process")
+    parser.add_argument("--legacy", action="store_true", help="also time the old per-rerun nltk.download calls")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep benchmark runs out of the app's databases.
+        env = {"CLS_DB_PATH": os.path.join(tmp, "bench.db"), "CLS_CACHE_PATH": os.path.join(tmp, "cache.db"),
+               **os.environ}
+        results = [run_child(args.reruns, args.legacy, env) for _ in range(args.runs)]
+
+    warm = sorted(ms for r in results for ms in r["warm_ms"])
+    print(f"processes:            {len(results)}")
+    print(f"import (page set):    {statistics.median(r['import_ms'] for r in results):8.1f} ms median")
+    print(f"cold ensure():        {statistics.median(r['cold_ms'] for r in results):8.1f} ms median")
+    if warm:
+        print(f"warm ensure() p50:    {statistics.median(warm):8.4f} ms")
+        print(f"warm ensure() p99:    {warm[int(len(warm) * 0.99) - 1]:8.4f} ms")
+    if args.legacy:
+        print(f"old nltk.download x3: {statistics.median(r['legacy_rerun_ms'] for r in results):8.1f} ms per rerun")
+    print(f"heavy modules loaded: {', '.join(results[0]['heavy_imported']) or 'none'}")
+    for problem in results[0]["problems"]:
+        print(f"warning: {problem}")
+
+
+if __name__ == "__main__":
+    main()
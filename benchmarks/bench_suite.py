@@ -0,0 +1,421 @@
+"""Reproducible benchmark suite: extraction, splitting, model throughput, page latency and load.
+
+Every run uses the fixed synthetic contracts in benchmarks/corpus.py (1, 10
+and 100 pages by default) and writes one JSON file, so two commits can be
+compared with ``--compare``. Measured:
+
+* extraction: PDF, DOCX and TXT, pages per second
+* sentence splitting: sentences per second
+* models: generation throughput of each model on its own page's inputs, uncached
+* pages: end-to-end latency of each page's pipeline (extraction included),
+  cold (empty caches) and warm (same document again), with the model and
+  tokenization time recorded by telemetry
+* load: concurrent sessions each submitting one-page contracts, with
+  latency percentiles and throughput, optionally through the inference server
+
+Runs offline on CPU. By default each generation model is replaced by a
+deterministic stand-in (benchmarks/standin.py) that costs time the way a
+seq2seq model does, so results measure the application's own overhead,
+batching and caching and are stable across machines. ``--models cached``
+uses the real models from the local Hugging Face cache instead. NLTK data
+must already be installed (``python -m cls_core warmup``). The app's
+databases are never touched: every run uses a temporary directory.
+
+Usage:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --sizes 1,10 --repeat 1 --sessions 1,16 --server
+    python benchmarks/bench_suite.py --compare benchmarks/results/base.json benchmarks/results/head.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import corpus  # noqa: E402
+
+FORMATS = ("pdf", "docx", "txt")
+PAGES = ("simplify", "text_analysis", "multilevel")
+SKIPPED = (ImportError, LookupError)  # missing optional package or NLTK data
+
+
+def isolate(workdir, models):
+    """Point the app at throwaway databases and keep everything offline. Call before importing cls_core."""
+    os.environ["CLS_DB_PATH"] = os.path.join(workdir, "app.db")
+    os.environ["CLS_CACHE_PATH"] = os.path.join(workdir, "cache.db")
+    os.environ["CLS_NLTK_DOWNLOAD"] = "0"
+    os.environ["CLS_MODEL_IDLE_TIMEOUT"] = "0"
+    os.environ["CLS_INFERENCE_URL"] = ""
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+    if models == "standin":
+        from benchmarks import standin
+        from cls_core import pipeline
+        return standin.install([pipeline.PARAPHRASE_MODEL, pipeline.ANALYSIS_MODEL, pipeline.LEVEL_MODEL])
+    return {}
+
+
+def median_time(fn, repeat):
+    """Return ``(median seconds, last result)`` of ``repeat`` calls."""
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(int(len(sorted_values) * q), len(sorted_values) - 1)]
+
+
+def reset_caches():
+    """Empty every cache a page run fills, so the next run is cold."""
+    from cls_core import glossary, readability
+    from cls_core.cache import get_cache
+
+    get_cache().clear()
+    for term, _, _ in glossary.list_terms(source="model"):
+        glossary.delete(term)
+    readability.sentence_counts.cache_clear()
+    readability.syllables.cache_clear()
+
+
+def bench_extraction(sizes, repeat):
+    from cls_core.extract import extract_text
+
+    results = {}
+    for fmt in FORMATS:
+        for pages in sizes:
+            data = corpus.make_file(pages, fmt)
+            try:
+                seconds, text = median_time(lambda: extract_text(io.BytesIO(data), f"contract.{fmt}"), repeat)
+            except SKIPPED as e:
+                results.setdefault(fmt, {})[str(pages)] = {"skipped": str(e)}
+                continue
+            results.setdefault(fmt, {})[str(pages)] = {
+                "bytes": len(data), "chars": len(text), "time_s": seconds, "pages_per_s": pages / seconds,
+            }
+    return results
+
+
+def bench_splitting(sizes, repeat):
+    from cls_core import pipeline
+
+    results = {}
+    for pages in sizes:
+        text = corpus.contract_text(pages)
+        seconds, sentences = median_time(lambda: pipeline.split_sentences(text), repeat)
+        results[str(pages)] = {"sentences": len(sentences), "time_s": seconds,
+                               "sentences_per_s": len(sentences) / seconds}
+    return results
+
+
+def model_inputs(pages):
+    """Return ``{model: (inputs, params)}``, each model fed what its page feeds it."""
+    from cls_core import pipeline
+
+    text = corpus.contract_text(pages)
+    sentences = pipeline.split_sentences(text)
+    return {
+        pipeline.PARAPHRASE_MODEL: (sentences, pipeline.PARAPHRASE_PARAMS),
+        pipeline.ANALYSIS_MODEL: ([f"simplify: {p}" for p in corpus.contract_pages(pages)], pipeline.ANALYSIS_PARAMS),
+        pipeline.LEVEL_MODEL: ([pipeline.PROMPTS["Intermediate"].format(text=c) for c in pipeline.level_chunks(text)],
+                               pipeline.LEVEL_PARAMS),
+    }
+
+
+def bench_models(pages, repeat):
+    from cls_core import inference
+    from cls_core.registry import get_model
+
+    results = {}
+    for model, (inputs, params) in model_inputs(pages).items():
+        try:
+            start = time.perf_counter()
+            get_model(model)
+            load_s = time.perf_counter() - start
+            tokens = sum(len(ids) for ids in inference.get_tokenizer(model)(inputs)["input_ids"])
+            seconds, _ = median_time(lambda: inference.generate(model, inputs, **params), repeat)
+        except (*SKIPPED, OSError) as e:  # OSError: model not in the local Hugging Face cache
+            results[model] = {"skipped": str(e)}
+            continue
+        results[model] = {"inputs": len(inputs), "load_s": load_s, "time_s": seconds,
+                          "inputs_per_s": len(inputs) / seconds, "tokens_in_per_s": tokens / seconds}
+    return results
+
+
+def run_page(page, text):
+    from cls_core import pipeline
+
+    if page == "simplify":
+        return pipeline.simplify_sentences(pipeline.split_sentences(text))
+    if page == "text_analysis":
+        return pipeline.analyze_text(text)
+    return {stage: result for stage, result, _ in pipeline.multilevel_graph(text).run()}
+
+
+def run_request(page, data, name, user_id=None):
+    """Extract and process one upload the way ``page`` does; return its telemetry counters."""
+    from cls_core import telemetry
+    from cls_core.extract import extract_text
+
+    start = time.perf_counter()
+    text = extract_text(io.BytesIO(data), name)
+    extraction_ms = (time.perf_counter() - start) * 1000
+    with telemetry.trace(f"bench-{page}", user_id, extraction_ms=extraction_ms) as request:
+        run_page(page, text)
+    return dict(request.values)
+
+
+def bench_pages(sizes, repeat, fmt="pdf"):
+    from cls_core import generation
+
+    results = {}
+    name = f"contract.{fmt}"
+    for page in PAGES:
+        for pages in sizes:
+            data = corpus.make_file(pages, fmt)
+            cold, warm, values = [], [], {}
+            try:
+                for _ in range(repeat):
+                    reset_caches()
+                    before = generation.stats()
+                    values = run_request(page, data, name)
+                    after = generation.stats()
+                    values.update({k: after[k] - before[k] for k in ("skipped", "decode_steps_saved")})
+                    cold.append(values)
+                    warm.append(run_request(page, data, name))
+            except SKIPPED as e:
+                results.setdefault(page, {})[str(pages)] = {"skipped": str(e)}
+                continue
+            middle = sorted(cold, key=lambda v: v["total_ms"])[len(cold) // 2]
+            results.setdefault(page, {})[str(pages)] = {
+                "cold_ms": statistics.median(v["total_ms"] + v["extraction_ms"] for v in cold),
+                "warm_ms": statistics.median(v["total_ms"] + v["extraction_ms"] for v in warm),
+                "cold_model_ms": middle["model_ms"],
+                "cold_tokenization_ms": middle["tokenization_ms"],
+                "extraction_ms": middle["extraction_ms"],
+                "cold_cache_misses": middle["cache_misses"],
+                "cold_skipped_plain": middle["skipped"],
+                "cold_decode_steps_saved": middle["decode_steps_saved"],
+                "warm_cache_hit_rate": statistics.median(
+                    v["cache_hits"] / max(v["cache_hits"] + v["cache_misses"], 1) for v in warm),
+            }
+    return results
+
+
+def start_server():
+    """Run the inference server on a free local port in this process and point the app at it."""
+    from http.server import ThreadingHTTPServer
+
+    from cls_core import inference, server
+
+    service = server.InferenceService()
+    handler = type("Handler", (server._Handler,), {"service": service})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name="bench-server", daemon=True).start()
+    inference.INFERENCE_URL = f"http://127.0.0.1:{httpd.server_address[1]}"
+    return service, httpd
+
+
+def bench_load(sessions_list, requests, page, use_server):
+    """Each session submits ``requests`` distinct one-page contracts back to back."""
+    from cls_core import inference
+
+    results = {}
+    for sessions in sessions_list:
+        # A fresh server per run, so its batch statistics cover this run only.
+        service, httpd = start_server() if use_server else (None, None)
+        try:
+            reset_caches()
+            latencies, errors = [], []
+            lock = threading.Lock()
+            # Distinct seeds: sessions share boilerplate, as real users do, but not whole documents.
+            docs = {(s, r): corpus.make_file(1, "txt", seed=1000 * sessions + 100 * s + r)
+                    for s in range(sessions) for r in range(requests)}
+
+            def session(s):
+                for r in range(requests):
+                    start = time.perf_counter()
+                    try:
+                        run_request(page, docs[s, r], "contract.txt", user_id=s)
+                    except Exception as e:
+                        with lock:
+                            errors.append(repr(e))
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - start)
+
+            threads = [threading.Thread(target=session, args=(s,)) for s in range(sessions)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            wall = time.perf_counter() - start
+            if errors and not latencies:
+                results[f"sessions_{sessions}"] = {"skipped": errors[0]}
+                continue
+            latencies.sort()
+            row = {
+                "requests": len(latencies) + len(errors), "errors": len(errors), "wall_s": wall,
+                "requests_per_s": len(latencies) / wall,
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p95_ms": percentile(latencies, 0.95) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+            }
+            if service:
+                stats = service.stats()
+                row["server_batches"] = {b["model"]: b["batch_size_histogram"] for b in stats["batchers"]}
+            results[f"sessions_{sessions}"] = row
+        finally:
+            inference.INFERENCE_URL = ""
+            if httpd:
+                httpd.shutdown()
+                httpd.server_close()
+    return results
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def flatten(tree, prefix=""):
+    flat = {}
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(base, head, threshold, min_ms=1.0):
+    """Print every timing metric of two result files; return how many regressed past ``threshold``.
+
+    Timings that moved by less than ``min_ms`` are never counted: at that
+    scale the change is scheduler noise, whatever the percentage.
+    """
+    old, new = flatten(base["results"]), flatten(head["results"])
+    regressions = 0
+    print(f"{'metric':60} {'base':>12} {'head':>12} {'change':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        if key.endswith("_per_s"):
+            higher_is_better = True
+        elif key.endswith(("_s", "_ms")):
+            higher_is_better = False
+        else:
+            continue
+        if not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key]
+        if higher_is_better:
+            worse = change < -threshold
+        else:
+            delta_ms = (new[key] - old[key]) * (1 if key.endswith("_ms") else 1000)
+            worse = change > threshold and delta_ms >= min_ms
+        regressions += worse
+        print(f"{key:60} {old[key]:12.2f} {new[key]:12.2f} {change:+8.1%}{'  REGRESSION' if worse else ''}")
+    print(f"\n{regressions} regression(s) beyond {threshold:.0%} "
+          f"({base['meta'].get('commit', '?')[:10]} -> {head['meta'].get('commit', '?')[:10]})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, corpus.SIZES)), help="contract sizes in pages")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the median is reported")
+    parser.add_argument("--models", choices=["standin", "cached"], default="standin")
+    parser.add_argument("--standin-cost", type=float, default=1.0, help="scale the stand-in models' time cost")
+    parser.add_argument("--model-pages", type=int, default=10, help="contract size fed to the model throughput runs")
+    parser.add_argument("--sessions", default="1,8,32", help="concurrent sessions for the load test")
+    parser.add_argument("--requests", type=int, default=5, help="requests per session in the load test")
+    parser.add_argument("--upload-format", choices=FORMATS, default="pdf", help="file type for the page runs")
+    parser.add_argument("--load-page", choices=PAGES, default="simplify")
+    parser.add_argument("--server", action="store_true", help="send load-test inference through the server")
+    parser.add_argument("--only", default="extraction,splitting,models,pages,load")
+    parser.add_argument("--output", help="result file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two result files and exit")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change counted as a regression")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore timing changes smaller than this")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f, open(args.compare[1]) as g:
+            sys.exit(1 if compare(json.load(f), json.load(g), args.threshold, args.min_ms) else 0)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    sessions = [int(s) for s in args.sessions.split(",") if s]
+    sections = set(args.only.split(","))
+    commit, dirty = git_commit()
+
+    with tempfile.TemporaryDirectory(prefix="cls-bench-") as workdir:
+        standins = isolate(workdir, args.models)
+        for model in standins.values():
+            model.cost = args.standin_cost
+
+        from cls_core import bootstrap, telemetry
+
+        problems = bootstrap.ensure(models=[], background=False)
+        for problem in problems:
+            print(f"warning: {problem}", file=sys.stderr)
+
+        results = {}
+        steps = [
+            ("extraction", lambda: bench_extraction(sizes, args.repeat)),
+            ("splitting", lambda: bench_splitting(sizes, args.repeat)),
+            ("models", lambda: bench_models(args.model_pages, args.repeat)),
+            ("pages", lambda: bench_pages(sizes, args.repeat, args.upload_format)),
+            ("load", lambda: bench_load(sessions, args.requests, args.load_page, args.server)),
+        ]
+        for name, step in steps:
+            if name not in sections:
+                continue
+            print(f"[{name}] ...", file=sys.stderr, flush=True)
+            try:
+                results[name] = step()
+            except SKIPPED as e:
+                results[name] = {"skipped": str(e)}
+        telemetry.flush()
+
+    report = {
+        "meta": {
+            "commit": commit, "dirty": dirty,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "models": args.models, "standin_cost": args.standin_cost,
+            "args": vars(args), "problems": problems,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{(commit or 'local')[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for key, value in flatten(results).items():
+        print(f"{key:60} {value:14.4f}")
+    print(f"\nwrote {output}")
+
+
+if __name__ == "__main__":
+    main()
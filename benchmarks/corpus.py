@@ -0,0 +1,145 @@
+"""Fixed synthetic contracts for the benchmarks, as text, PDF, DOCX or TXT.
+
+``contract_pages(pages)`` is deterministic: the same page count always gives
+byte-identical text, so results from different commits are comparable. Each
+page is one numbered clause of about 450 words. Most sentences are filled-in
+templates, and a share of them are boilerplate that repeats across the
+document, as real contracts do.
+"""
+import io
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+SIZES = (1, 10, 100)
+
+PARTIES = ["the Supplier", "the Customer", "the Licensor", "the Licensee", "the Contractor", "the Company"]
+HEADINGS = ["DEFINITIONS", "SERVICES", "FEES AND PAYMENT", "CONFIDENTIALITY", "INTELLECTUAL PROPERTY",
+            "WARRANTIES", "INDEMNITY", "LIMITATION OF LIABILITY", "TERM AND TERMINATION", "DATA PROTECTION",
+            "FORCE MAJEURE", "ASSIGNMENT", "NOTICES", "GOVERNING LAW"]
+TEMPLATES = [
+    "{a} shall deliver the Deliverables described in Schedule {n} no later than {days} days after the Effective Date.",
+    "{a} shall pay {b} the sum of {amount} within {days} days of receipt of a valid invoice.",
+    "Notwithstanding clause {n}.{m}, {a} shall not be liable to {b} for any indirect, special or consequential loss.",
+    "{a} may terminate this Agreement on {days} days written notice if {b} commits a material breach of clause {n}.",
+    "Subject to clause {n}.{m}, {a} shall indemnify {b} against all losses, liabilities, damages, costs and expenses "
+    "(including reasonable legal fees) arising out of any breach of its obligations under this Agreement.",
+    "{a} shall keep confidential all Confidential Information disclosed by {b} and shall not use it except for the "
+    "purpose of performing its obligations hereunder.",
+    "Any dispute arising under clause {n} shall be referred in the first instance to the senior representatives of "
+    "{a} and {b}, who shall meet within {days} days to resolve it.",
+    "The aggregate liability of {a} under or in connection with this Agreement shall not exceed {amount} in any "
+    "Contract Year.",
+    "{a} warrants that the Services will be performed with reasonable skill and care and in accordance with Good "
+    "Industry Practice.",
+    "All Intellectual Property Rights in the Deliverables shall vest in {b} upon payment in full of the Charges.",
+]
+BOILERPLATE = [
+    "This Agreement shall be governed by and construed in accordance with the laws of England and Wales.",
+    "No failure or delay by a party to exercise any right or remedy provided under this Agreement shall constitute "
+    "a waiver of that or any other right or remedy.",
+    "Each party shall, at its own expense, execute such documents as may reasonably be required to give full effect "
+    "to this Agreement.",
+    "Nothing in this Agreement is intended to, or shall be deemed to, establish any partnership or joint venture "
+    "between the parties.",
+]
+PAGE_WORDS = 450
+
+
+def contract_pages(pages, seed=0):
+    """Return ``pages`` page texts, each one numbered clause of sub-clauses."""
+    rng = random.Random(seed)
+    out = []
+    for n in range(1, pages + 1):
+        lines = [f"{n}. {HEADINGS[(n - 1) % len(HEADINGS)]}"]
+        words, m = 0, 0
+        while words < PAGE_WORDS:
+            m += 1
+            if rng.random() < 0.2:
+                sentence = rng.choice(BOILERPLATE)
+            else:
+                a, b = rng.sample(PARTIES, 2)
+                sentence = rng.choice(TEMPLATES).format(
+                    a=a, b=b, n=rng.randint(1, pages), m=rng.randint(1, 9),
+                    days=rng.choice([7, 10, 14, 30, 45, 60, 90]), amount=f"£{rng.randint(1, 500) * 1000:,}",
+                )
+                sentence = sentence[0].upper() + sentence[1:]
+            lines.append(f"{n}.{m} {sentence}")
+            words += len(sentence.split())
+        out.append("\n".join(lines))
+    return out
+
+
+def contract_text(pages, seed=0):
+    return "\n\n".join(contract_pages(pages, seed))
+
+
+def _escape_pdf(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages):
+    """Build a minimal text-only PDF with one page per list of lines."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        body = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({_escape_pdf(line)}) Tj T*" for line in lines) + " ET"
+        stream = body.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{k} 0 R" for k in kids).encode(), len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (i, obj))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+_DOCX_TYPES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+               '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+               '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+               '<Default Extension="xml" ContentType="application/xml"/>'
+               '<Override PartName="/word/document.xml" ContentType="application/'
+               'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+_DOCX_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+              '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+              '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+              'officeDocument" Target="word/document.xml"/></Relationships>')
+
+
+def make_docx(pages):
+    """Build a minimal DOCX with one paragraph per line and a page break between pages."""
+    body = []
+    for i, lines in enumerate(pages):
+        if i:
+            body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        body.extend(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{"".join(body)}</w:body></w:document>')
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _DOCX_TYPES)
+        z.writestr("_rels/.rels", _DOCX_RELS)
+        z.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+def make_file(pages, fmt, seed=0):
+    """Return the bytes of a ``pages``-page contract in ``fmt`` (pdf, docx or txt)."""
+    texts = contract_pages(pages, seed)
+    if fmt == "txt":
+        return "\n\n".join(texts).encode("utf-8")
+    lines = [t.split("\n") for t in texts]
+    return make_pdf(lines) if fmt == "pdf" else make_docx(lines)
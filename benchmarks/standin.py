@@ -0,0 +1,98 @@
+"""Deterministic stand-ins for the generation models, so benchmarks run offline on CPU.
+
+A stand-in takes the same calls as a transformers text2text-generation
+pipeline and returns ``[{"generated_text": ...}]``. Its output is the input
+with common legalese swapped for plain words, cut to the generation length
+limit. Its time cost follows a seq2seq model: an encoder pass over the
+padded batch, then one decoder step per output token, each step costing a
+little more for every row in the batch. The cost is spent sleeping, which,
+like torch, releases the GIL, so the CPU is left to the application code
+being measured. Calls to one model are serialized, as they effectively are
+when a real model's forward pass already uses every core.
+
+``install()`` registers a stand-in under each generation model name, in
+place of the real loader.
+"""
+import re
+import threading
+import time
+import zlib
+
+# Seconds per unit of work; scaled by install(cost=...).
+BATCH_OVERHEAD = 0.004
+ENCODER_TOKEN = 0.000002  # per padded input token
+DECODER_STEP = 0.0008  # per decoder step, whatever the batch size
+DECODER_ROW = 0.00004  # per row per decoder step
+OUTPUT_RATIO = 0.8  # output tokens per input token, before the length limit
+
+PLAIN = {
+    "notwithstanding": "despite", "hereunder": "under this agreement", "hereinafter": "from now on",
+    "shall": "must", "indemnify": "compensate", "aggregate": "total", "vest": "pass", "construed": "read",
+    "pursuant": "under", "forthwith": "immediately", "consequential": "indirect",
+}
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_PLAIN = re.compile(r"\b(" + "|".join(PLAIN) + r")\b", re.IGNORECASE)
+
+
+class StandInTokenizer:
+    """Word-and-punctuation tokenizer with the call signature of a Hugging Face tokenizer."""
+
+    vocab_size = 32000
+    eos_token_id = 1
+
+    def _encode(self, text, add_special_tokens):
+        ids = [zlib.crc32(t.encode("utf-8")) % (self.vocab_size - 2) + 2 for t in _TOKEN.findall(text)]
+        return ids + [self.eos_token_id] if add_special_tokens else ids
+
+    def __call__(self, texts, add_special_tokens=True, **kwargs):
+        if isinstance(texts, str):
+            return {"input_ids": self._encode(texts, add_special_tokens)}
+        return {"input_ids": [self._encode(t, add_special_tokens) for t in texts]}
+
+
+class StandInModel:
+    def __init__(self, name, cost=1.0):
+        self.name = name
+        self.cost = cost
+        self.tokenizer = StandInTokenizer()
+        self.calls = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def steps(self, input_tokens, max_length=None, max_new_tokens=None, min_length=0, min_new_tokens=0, **gen):
+        """Decoder steps for one row: its natural output length, within the generation limits."""
+        natural = max(int(input_tokens * OUTPUT_RATIO), 1)
+        limit = max_new_tokens or max_length or natural
+        return max(min(natural, limit), min_new_tokens or min_length or 0)
+
+    def _generate(self, text, limit):
+        words = _PLAIN.sub(lambda m: PLAIN[m.group(0).lower()], text).split()
+        return " ".join(words[:limit])
+
+    def __call__(self, texts, batch_size=None, num_return_sequences=1, num_beams=1, **gen):
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        lengths = [len(ids) for ids in self.tokenizer(texts)["input_ids"]]
+        steps = [self.steps(n, **gen) for n in lengths]
+        if self.cost:
+            width = max(lengths, default=0) * len(texts)
+            decode = max(steps, default=0) * (DECODER_STEP + DECODER_ROW * len(texts) * num_beams)
+            with self._lock:
+                time.sleep(self.cost * (BATCH_OVERHEAD + ENCODER_TOKEN * width + decode))
+        with self._lock:
+            self.calls += 1
+            self.rows += len(texts)
+        return [[{"generated_text": self._generate(t, s)}] * num_return_sequences for t, s in zip(texts, steps)]
+
+
+def install(names, cost=1.0):
+    """Serve each model in ``names`` from a stand-in; returns ``{name: StandInModel}``."""
+    from cls_core import inference
+    from cls_core.registry import registry
+
+    models = {name: StandInModel(name, cost) for name in names}
+    for name, model in models.items():
+        registry.register(name, lambda model=model: model, replace=True)
+    # With an inference server the app loads only tokenizers locally; give it the stand-in's.
+    remote_tokenizer = inference._remote_tokenizer
+    inference._remote_tokenizer = lambda name: models[name].tokenizer if name in models else remote_tokenizer(name)
+    return models
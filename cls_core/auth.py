@@ -0,0 +1,136 @@
+"""Account storage and password checks, with bcrypt kept off the Streamlit script thread.
+
+Hashing and verification run in a small bounded thread pool (the bcrypt
+backend releases the GIL), so a burst of logins queues for
+``CLS_AUTH_WORKERS`` CPU slots instead of pinning every session's script
+thread. The cost factor comes from ``CLS_BCRYPT_ROUNDS``; when it changes,
+a user's hash is upgraded the next time they log in.
+
+A successful :func:`login` returns a session token. :func:`session_user`
+resolves it with a dictionary lookup, so page reruns never verify the
+password again.
+"""
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from passlib.context import CryptContext
+
+from cls_core.db import get_conn
+
+ROUNDS = int(os.getenv("CLS_BCRYPT_ROUNDS", "12"))
+MAX_WORKERS = int(os.getenv("CLS_AUTH_WORKERS", "2"))
+SESSION_TTL = float(os.getenv("CLS_SESSION_TTL", "43200"))  # seconds
+
+# Hashes made with any other cost factor are flagged by needs_update and upgraded on login.
+passwords = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=ROUNDS,
+                         bcrypt__min_rounds=ROUNDS, bcrypt__max_rounds=ROUNDS)
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="cls-auth")
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def hash_password(password):
+    return _executor.submit(passwords.hash, password).result()
+
+
+def _verify(password, password_hash):
+    if password_hash is None:
+        # Unknown email: burn the same time as a real check so accounts can't be probed by timing.
+        passwords.dummy_verify()
+        return False, None
+    return passwords.verify_and_update(password, password_hash)
+
+
+def create_user(name, email, password):
+    password_hash = hash_password(password)
+    conn = get_conn()
+    try:
+        conn.execute("INSERT INTO users (name, email, password_hash, created_at) VALUES (?, ?, ?, ?)",
+                     (name, email, password_hash, datetime.utcnow().isoformat()))
+        conn.commit()
+        return True, None
+    except sqlite3.IntegrityError:
+        return False, "Email already exists."
+    finally:
+        conn.close()
+
+
+def verify_user(email, password):
+    """Return ``{"id", "name", "email"}`` if the password matches, else None."""
+    conn = get_conn()
+    user = conn.execute("SELECT id, name, email, password_hash FROM users WHERE email=?", (email,)).fetchone()
+    conn.close()
+    ok, new_hash = _executor.submit(_verify, password, user[3] if user else None).result()
+    if not ok:
+        return None
+    if new_hash:
+        conn = get_conn()
+        conn.execute("UPDATE users SET password_hash=? WHERE id=? AND password_hash=?", (new_hash, user[0], user[3]))
+        conn.commit()
+        conn.close()
+    return {"id": user[0], "name": user[1], "email": user[2]}
+
+
+def reset_password(email, new_password):
+    password_hash = hash_password(new_password)
+    conn = get_conn()
+    row = conn.execute("SELECT id FROM users WHERE email=?", (email,)).fetchone()
+    conn.execute("UPDATE users SET password_hash=? WHERE email=?", (password_hash, email))
+    conn.commit()
+    conn.close()
+    if row:
+        revoke_user(row[0])
+
+
+# ====== SESSION TOKENS ======
+def login(email, password):
+    """Verify credentials once; return ``(user, token)`` or ``(None, None)``."""
+    user = verify_user(email, password)
+    if user is None:
+        return None, None
+    token = secrets.token_urlsafe(32)
+    now = time.time()
+    with _sessions_lock:
+        for t in [t for t, (_, expires) in _sessions.items() if expires < now]:
+            del _sessions[t]
+        _sessions[token] = (user, now + SESSION_TTL)
+    return user, token
+
+
+def session_user(token):
+    """Return the user a live token was issued to, or None."""
+    entry = _sessions.get(token) if token else None
+    if entry is None or entry[1] < time.time():
+        return None
+    return entry[0]
+
+
+def logout(token):
+    with _sessions_lock:
+        _sessions.pop(token, None)
+
+
+def owner_key(session_state):
+    """Return the key a browser session's jobs, document history and model requests belong to.
+
+    Logged-in sessions share their account's ``user:<id>``. An anonymous
+    session gets a random key of its own, kept in ``session_state``, so
+    anonymous visitors are never lumped together under a NULL user id.
+    """
+    user = session_state.get("user")
+    if user is not None:
+        return f"user:{user['id']}"
+    return session_state.setdefault("owner", f"session:{secrets.token_hex(16)}")
+
+
+def revoke_user(user_id):
+    """Invalidate every session of ``user_id`` (after a password change)."""
+    with _sessions_lock:
+        for t in [t for t, (user, _) in _sessions.items() if user["id"] == user_id]:
+            del _sessions[t]
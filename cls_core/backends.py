@@ -0,0 +1,117 @@
+"""CPU inference backends for the text2text-generation models.
+
+* ``torch``: the stock fp32 ``transformers.pipeline``.
+* ``int8``: the same model with its ``nn.Linear`` layers dynamically
+  quantized to int8 (weights stored int8, activations quantized per batch).
+* ``onnx``: an ONNX Runtime export via ``optimum``, written once to
+  ``CLS_ONNX_CACHE/<model>`` and reloaded from there afterwards.
+
+The backend is chosen per model: ``CLS_MODEL_BACKENDS="t5-base=int8,..."``
+overrides ``CLS_MODEL_BACKEND`` (default ``torch``). Every backend returns a
+pipeline, so batching, caching and telemetry work unchanged.
+"""
+import difflib
+import os
+
+BACKENDS = ("torch", "int8", "onnx")
+DEFAULT_BACKEND = os.getenv("CLS_MODEL_BACKEND", "torch")
+ONNX_CACHE = os.getenv("CLS_ONNX_CACHE", "onnx_cache")
+
+# Fixed inputs for parity checks: short, long, numeric and list-heavy clauses.
+PARITY_SENTENCES = [
+    "This Agreement shall be governed by and construed in accordance with the laws of the State of New York.",
+    "Notwithstanding the foregoing, neither party shall be liable for any indirect or consequential damages.",
+    "The Supplier shall indemnify the Customer against all losses arising from a breach of this clause.",
+    "Either party may terminate this Agreement upon thirty (30) days' written notice to the other party.",
+    "Payment is due within forty-five days of receipt of a valid invoice.",
+    "Confidential Information does not include information that is or becomes publicly available through no "
+    "fault of the Recipient.",
+    "Any amendment to this Agreement must be in writing and signed by authorised representatives of both parties.",
+    "Fees are exclusive of VAT, sales, use and similar taxes, duties and levies.",
+]
+
+
+def _parse_overrides(value):
+    overrides = {}
+    for item in value.split(","):
+        if "=" in item:
+            model, backend = item.rsplit("=", 1)
+            overrides[model.strip()] = backend.strip()
+    return overrides
+
+
+_OVERRIDES = _parse_overrides(os.getenv("CLS_MODEL_BACKENDS", ""))
+
+
+def backend_for(model_id):
+    backend = _OVERRIDES.get(model_id, DEFAULT_BACKEND)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r} for {model_id}; expected one of {', '.join(BACKENDS)}")
+    return backend
+
+
+def load_torch(model_id, task):
+    from transformers import pipeline
+    return pipeline(task, model=model_id)
+
+
+def load_int8(model_id, task):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
+    model.eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model_id))
+
+
+def onnx_path(model_id):
+    return os.path.join(ONNX_CACHE, model_id.replace("/", "--"))
+
+
+def load_onnx(model_id, task):
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise ImportError("The onnx backend needs `pip install optimum[onnxruntime]`.") from e
+    from transformers import AutoTokenizer, pipeline
+
+    path = onnx_path(model_id)
+    if os.path.isdir(path):
+        model = ORTModelForSeq2SeqLM.from_pretrained(path)
+        tokenizer = AutoTokenizer.from_pretrained(path)
+    else:
+        # Exporting takes minutes for the base models, so the result is kept on disk.
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_id, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        tmp = f"{path}.partial"
+        model.save_pretrained(tmp)
+        tokenizer.save_pretrained(tmp)
+        os.replace(tmp, path)
+    return pipeline(task, model=model, tokenizer=tokenizer)
+
+
+LOADERS = {"torch": load_torch, "int8": load_int8, "onnx": load_onnx}
+
+
+def load(model_id, task="text2text-generation", backend=None):
+    return LOADERS[backend or backend_for(model_id)](model_id, task)
+
+
+def parity_check(expected, actual, sentences=PARITY_SENTENCES):
+    """Compare a candidate backend's outputs on ``sentences`` with the reference backend's.
+
+    Takes outputs rather than pipelines, so each backend can run (and have
+    its memory measured) in a process of its own, as
+    ``benchmarks/bench_backends.py`` does. Returns a summary with the share of
+    identical outputs, the mean character-level similarity, and the rows that
+    differ.
+    """
+    ratios = [difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(expected, actual)]
+    return {
+        "sentences": len(sentences),
+        "exact_match": sum(a == b for a, b in zip(expected, actual)) / len(sentences),
+        "mean_similarity": sum(ratios) / len(ratios),
+        "diffs": [{"source": s, "reference": a, "candidate": b, "similarity": round(r, 3)}
+                  for s, a, b, r in zip(sentences, expected, actual, ratios) if a != b],
+    }
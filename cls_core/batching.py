@@ -0,0 +1,95 @@
+"""Length-bucketed batch inference for text2text-generation pipelines."""
+import os
+
+from cls_core import generation, telemetry
+
+DEFAULT_BATCH_SIZE = int(os.getenv("CLS_BATCH_SIZE", "16"))
+# Upper bound on padded input tokens per batch (longest sequence x batch rows).
+DEFAULT_MAX_TOKENS = int(os.getenv("CLS_BATCH_MAX_TOKENS", "2048"))
+# Sentences simplified per step when results are rendered as they finish.
+DEFAULT_STREAM_WINDOW = int(os.getenv("CLS_STREAM_WINDOW", "8"))
+
+
+def token_lengths(model, texts):
+    """Return the input length of each text, in model tokens when a tokenizer is available."""
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return [len(t.split()) for t in texts]
+    encoded = tokenizer(list(texts), add_special_tokens=True)["input_ids"]
+    return [len(ids) for ids in encoded]
+
+
+def make_batches(lengths, batch_size=DEFAULT_BATCH_SIZE, max_tokens=DEFAULT_MAX_TOKENS):
+    """Group item indices into batches of similar length.
+
+    Items are sorted by length so each batch pads to a nearby length, and a
+    batch is closed once it holds ``batch_size`` items or padding it to its
+    longest item would exceed ``max_tokens``.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, current = [], []
+    for i in order:
+        width = max(lengths[i], 1)
+        if current and (len(current) >= batch_size or width * (len(current) + 1) > max_tokens):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def generate_batch(model, texts, **gen_kwargs):
+    """Run one forward pass over ``texts`` and return the generated strings."""
+    results = model(list(texts), batch_size=len(texts), **gen_kwargs)
+    outputs = []
+    for res in results:
+        # Pipelines return a list of candidates per input unless it can unwrap them.
+        if isinstance(res, list):
+            res = res[0]
+        outputs.append(res["generated_text"])
+    return outputs
+
+
+def simplify_batched(model, texts, batch_size=DEFAULT_BATCH_SIZE, max_tokens=DEFAULT_MAX_TOKENS, **gen_kwargs):
+    """Simplify every text in length-bucketed batches and return outputs in input order.
+
+    A length policy in ``gen_kwargs`` (see :mod:`cls_core.generation`) sets
+    each batch's token budget from the lengths of the inputs in it.
+    """
+    texts = list(texts)
+    outputs = [""] * len(texts)
+    pending = [i for i, t in enumerate(texts) if t.strip()]
+    if not pending:
+        return outputs
+    with telemetry.span("tokenization"):
+        lengths = token_lengths(model, [texts[i] for i in pending])
+    telemetry.add(tokens_in=sum(lengths))
+    for batch in make_batches(lengths, batch_size, max_tokens):
+        indices = [pending[b] for b in batch]
+        params = generation.resolve([lengths[b] for b in batch], gen_kwargs)
+        with telemetry.span("model"):
+            generated = generate_batch(model, [texts[i] for i in indices], **params)
+        for i, out in zip(indices, generated):
+            outputs[i] = out
+    with telemetry.span("tokenization"):
+        telemetry.add(tokens_out=sum(token_lengths(model, [outputs[i] for i in pending])))
+    return outputs
+
+
+def iter_windows(texts, window=DEFAULT_STREAM_WINDOW):
+    """Yield ``(start, texts[start:start + window])`` in document order.
+
+    Simplifying one window at a time lets callers render results as each
+    window finishes instead of waiting for the whole document. ``texts`` may
+    be a lazy stream; each window is yielded as soon as it fills.
+    """
+    start, current = 0, []
+    for text in texts:
+        current.append(text)
+        if len(current) == window:
+            yield start, current
+            start += window
+            current = []
+    if current:
+        yield start, current
@@ -0,0 +1,127 @@
+"""Once-per-process warmup of NLP resources, kept off the page rerun path.
+
+Streamlit re-executes a page script on every interaction. :func:`ensure`
+does the expensive work (locating NLTK data, downloading anything missing,
+loading the punkt tokenizer and stopword list, optionally loading models)
+the first time it is called in a process and returns immediately after
+that, so pages can call it unconditionally at the top.
+
+NLTK data is read from ``CLS_NLTK_DATA`` (default ``nltk_data`` in the
+working directory) before NLTK's usual search path. Set
+``CLS_NLTK_DOWNLOAD=0`` on offline hosts: missing resources are then
+reported instead of fetched.
+"""
+import os
+import threading
+import time
+
+NLTK_DATA_DIR = os.path.abspath(os.getenv("CLS_NLTK_DATA", "nltk_data"))
+ALLOW_DOWNLOAD = os.getenv("CLS_NLTK_DOWNLOAD", "1") != "0"
+WARMUP_MODELS = [m.strip() for m in os.getenv("CLS_WARMUP_MODELS", "").split(",") if m.strip()]
+
+# punkt_tab replaces punkt from NLTK 3.8.2; either one is enough for sent_tokenize.
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+}
+
+_lock = threading.Lock()
+_problems = None
+_stats = {
+    "cold_start_ms": None,
+    "warm_calls": 0,
+    "warm_total_ms": 0.0,
+    "last_warm_ms": None,
+    "downloaded": [],
+    "missing": [],
+    "models": {},
+}
+
+
+def _find(path):
+    import nltk
+    try:
+        nltk.data.find(path)
+        return True
+    except LookupError:
+        return False
+
+
+def ensure_nltk():
+    """Locate (and if allowed, download) NLTK data, then load it. Returns problems found."""
+    import nltk
+
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+    for name, path in NLTK_RESOURCES.items():
+        if _find(path):
+            continue
+        if ALLOW_DOWNLOAD and nltk.download(name, download_dir=NLTK_DATA_DIR, quiet=True) and _find(path):
+            _stats["downloaded"].append(name)
+        else:
+            _stats["missing"].append(name)
+
+    # Loading once here means the first request doesn't pay for unpickling punkt.
+    hint = f"Run `python -m cls_core warmup` with network access, or copy the data into {NLTK_DATA_DIR}."
+    problems = []
+    try:
+        from nltk.tokenize import sent_tokenize
+        sent_tokenize("Warm up. Done.")
+    except LookupError:
+        problems.append(f"NLTK sentence tokenizer (punkt) is not installed. {hint}")
+    try:
+        from cls_core.preprocess import stopword_set
+        stopword_set()
+    except LookupError:
+        problems.append(f"NLTK stopwords are not installed. {hint}")
+    return problems
+
+
+def _warm_models(names):
+    from cls_core.registry import get_model
+    for name in names:
+        start = time.perf_counter()
+        try:
+            get_model(name)
+            _stats["models"][name] = round((time.perf_counter() - start) * 1000, 1)
+        except Exception as e:
+            _stats["models"][name] = f"failed: {e}"
+
+
+def ensure(models=None, background=True):
+    """Warm up this process once; later calls only record how cheap a warm rerun was.
+
+    Returns a list of human-readable problems (empty when everything needed
+    is available). Models named in ``models`` (default ``CLS_WARMUP_MODELS``)
+    are loaded in a background thread so the calling page isn't blocked.
+    """
+    global _problems
+    start = time.perf_counter()
+    if _problems is None:
+        with _lock:
+            if _problems is None:
+                _problems = ensure_nltk()
+                _stats["cold_start_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                names = WARMUP_MODELS if models is None else list(models)
+                if names and background:
+                    threading.Thread(target=_warm_models, args=(names,), name="model-warmup", daemon=True).start()
+                elif names:
+                    _warm_models(names)
+                return _problems
+    elapsed = (time.perf_counter() - start) * 1000
+    _stats["warm_calls"] += 1
+    _stats["warm_total_ms"] += elapsed
+    _stats["last_warm_ms"] = round(elapsed, 4)
+    return _problems
+
+
+def stats():
+    """Return cold-start and warm-rerun timings for this process."""
+    calls = _stats["warm_calls"]
+    return {
+        **{k: v for k, v in _stats.items() if k != "warm_total_ms"},
+        "avg_warm_ms": round(_stats["warm_total_ms"] / calls, 4) if calls else None,
+        "ready": _problems == [],
+    }
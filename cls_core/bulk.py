@@ -0,0 +1,135 @@
+"""Bulk simplification of many contracts: parallel extraction, shared inference, ZIP output."""
+import csv
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from cls_core import dedup
+from cls_core.extract import SUPPORTED_TYPES, extract_text, file_type
+
+MAX_WORKERS = int(os.getenv("CLS_BULK_WORKERS", str(os.cpu_count() or 2)))
+# Total uncompressed size of the supported files unpacked from the ZIP archives of one upload.
+MAX_UNZIPPED_BYTES = int(os.getenv("CLS_BULK_MAX_UNZIPPED_MB", "200")) * 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """The ZIP archives of an upload would unpack to more than ``CLS_BULK_MAX_UNZIPPED_MB``."""
+
+
+def safe_name(name):
+    """Return ``name`` as a relative path with no ``..``, drive or leading ``/`` left to escape a folder."""
+    parts = name.replace("\\", "/").split("/")
+    if parts and parts[0].endswith(":"):
+        parts = parts[1:]
+    return "/".join(p for p in parts if p not in ("", ".", "..")) or "document"
+
+
+def expand_uploads(files, max_unzipped=MAX_UNZIPPED_BYTES):
+    """Return ``(name, bytes)`` for every supported file, unpacking ZIP archives.
+
+    Member names are made safe with :func:`safe_name`. Sizes are checked
+    from the archive directory before anything is decompressed (reads stop
+    at the declared size), and :class:`UploadTooLarge` is raised past
+    ``max_unzipped`` bytes in total.
+    """
+    items, unzipped = [], 0
+    for f in files:
+        data = f.getvalue() if hasattr(f, "getvalue") else f.read()
+        if file_type(f.name) != "zip":
+            items.append((safe_name(f.name), data))
+            continue
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            members = [info for info in archive.infolist()
+                       if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+                       and file_type(info.filename) in SUPPORTED_TYPES]
+            unzipped += sum(info.file_size for info in members)
+            if unzipped > max_unzipped:
+                raise UploadTooLarge(f"The ZIP archives unpack to more than {max_unzipped // (1024 * 1024)} MB; "
+                                     f"upload fewer contracts at a time.")
+            items.extend((safe_name(info.filename), archive.read(info)) for info in members)
+    return items
+
+
+def _extract_one(item):
+    # Runs in a worker process: PyPDF2 parsing is CPU-bound and holds the GIL.
+    name, data = item
+    start = time.perf_counter()
+    try:
+        text, error = extract_text(io.BytesIO(data), name), None
+    except Exception as e:
+        text, error = "", str(e)
+    return name, text, time.perf_counter() - start, error
+
+
+def extract_all(items, max_workers=MAX_WORKERS):
+    """Extract every ``(name, bytes)`` item in a process pool, keeping input order."""
+    if len(items) <= 1 or max_workers <= 1:
+        return [_extract_one(item) for item in items]
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(_extract_one, items))
+
+
+def simplify_documents(extracted, simplify_sentences):
+    """Simplify all documents' sentences in one call so they share batches and the cache.
+
+    Repeated and near-identical sentences across the whole upload are
+    simplified once (see :mod:`cls_core.dedup`). ``simplify_sentences`` takes
+    a list of sentences and returns their simplifications in order. Returns
+    one result dict per document, including the model calls it saved.
+    """
+    from nltk.tokenize import sent_tokenize
+
+    results, all_sentences = [], []
+    for name, text, extract_s, error in extracted:
+        start = time.perf_counter()
+        sentences = sent_tokenize(text) if text else []
+        results.append({
+            "name": name,
+            "error": error,
+            "offset": len(all_sentences),
+            "sentences": len(sentences),
+            "extraction_s": extract_s,
+            "split_s": time.perf_counter() - start,
+        })
+        all_sentences.extend(sentences)
+
+    plan = dedup.plan(all_sentences)
+    start = time.perf_counter()
+    outputs = plan.fan_out(simplify_sentences(plan.unique) if plan.unique else [])
+    inference_s = time.perf_counter() - start
+
+    for r in results:
+        r["simplified"] = " ".join(outputs[r["offset"]:r["offset"] + r["sentences"]])
+        r["calls_saved"] = plan.saved_between(r["offset"], r["offset"] + r["sentences"])
+        # Inference is shared, so each file is charged its share by sentence count.
+        r["inference_s"] = inference_s * r["sentences"] / len(all_sentences) if all_sentences else 0.0
+    return results
+
+
+def timing_report(results):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["file", "sentences", "calls_saved", "extraction_s", "split_s", "inference_s", "error"])
+    for r in results:
+        writer.writerow([r["name"], r["sentences"], r["calls_saved"], f"{r['extraction_s']:.3f}",
+                         f"{r['split_s']:.3f}", f"{r['inference_s']:.3f}", r["error"] or ""])
+    return out.getvalue()
+
+
+def build_archive(results):
+    """Return ZIP bytes holding ``<file>.simplified.txt`` per document plus ``timing_report.csv``."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        used = set()
+        for r in results:
+            if r["error"]:
+                continue
+            name = f"{os.path.splitext(safe_name(r['name']))[0]}.simplified.txt"
+            while name in used:
+                name = "_" + name
+            used.add(name)
+            archive.writestr(name, r["simplified"])
+        archive.writestr("timing_report.csv", timing_report(results))
+    return buffer.getvalue()
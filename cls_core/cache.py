@@ -0,0 +1,229 @@
+"""Persistent, content-addressed cache of model outputs shared by every page."""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from cls_core import backends, telemetry
+
+CACHE_PATH = os.getenv("CLS_CACHE_PATH", "cls_cache.db")
+DEFAULT_MAX_ENTRIES = int(os.getenv("CLS_CACHE_MAX_ENTRIES", "100000"))
+DEFAULT_MAX_BYTES = int(os.getenv("CLS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # stored output bytes; 0 = no limit
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text):
+    """Collapse whitespace so layout differences between uploads share one entry."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def make_key(model_name, mode, params, text):
+    """Hash (model, mode, generation params, normalized text) into a cache key."""
+    header = json.dumps([model_name, mode, params or {}], sort_keys=True, default=str)
+    text_hash = hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{header}\x1f{text_hash}".encode("utf-8")).hexdigest()
+
+
+class SimplificationCache:
+    """SQLite-backed LRU cache keyed by :func:`make_key`.
+
+    It is bounded both by entry count and by the total size of the stored
+    outputs. Triggers keep both totals in ``cache_stats`` as rows are added,
+    resized or removed, so neither bound check scans the table.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                output TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_last_used ON cache_entries (last_used);
+            CREATE TABLE IF NOT EXISTS cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO cache_stats (name, value) VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+            CREATE TRIGGER IF NOT EXISTS cache_entries_added AFTER INSERT ON cache_entries BEGIN
+                UPDATE cache_stats SET value = value + 1 WHERE name = 'entries';
+                UPDATE cache_stats SET value = value + NEW.size WHERE name = 'bytes';
+            END;
+            CREATE TRIGGER IF NOT EXISTS cache_entries_resized AFTER UPDATE OF size ON cache_entries BEGIN
+                UPDATE cache_stats SET value = value + NEW.size - OLD.size WHERE name = 'bytes';
+            END;
+            CREATE TRIGGER IF NOT EXISTS cache_entries_removed AFTER DELETE ON cache_entries BEGIN
+                UPDATE cache_stats SET value = value - 1 WHERE name = 'entries';
+                UPDATE cache_stats SET value = value - OLD.size WHERE name = 'bytes';
+            END;
+        """)
+        # Caches created before the running totals existed are counted once, here.
+        self._conn.execute("INSERT OR IGNORE INTO cache_stats (name, value) "
+                           "SELECT 'entries', COUNT(*) FROM cache_entries")
+        self._conn.execute("INSERT OR IGNORE INTO cache_stats (name, value) "
+                           "SELECT 'bytes', COALESCE(SUM(size), 0) FROM cache_entries")
+        self._conn.commit()
+
+    def get_many(self, model_name, mode, params, texts):
+        """Return ``{text: output}`` for every text already in the cache."""
+        keys = {}
+        for t in texts:
+            keys.setdefault(make_key(model_name, mode, params, t), []).append(t)
+        if not keys:
+            return {}
+        found = {}
+        hits = 0
+        with self._lock:
+            key_list = list(keys)
+            # Stay well under SQLite's bound-parameter limit.
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, output FROM cache_entries WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, output in rows:
+                    for t in keys[key]:
+                        found[t] = output
+                if rows:
+                    hits += len(rows)
+                    self._conn.execute(
+                        f"UPDATE cache_entries SET hits = hits + 1, last_used = ? "
+                        f"WHERE key IN ({','.join('?' * len(rows))})",
+                        [time.time()] + [key for key, _ in rows],
+                    )
+            self._bump("hits", hits)
+            self._bump("misses", len(keys) - hits)
+            self._conn.commit()
+        return found
+
+    def put_many(self, model_name, mode, params, pairs):
+        """Store ``(text, output)`` pairs and evict least recently used entries past either bound."""
+        now = time.time()
+        rows = [
+            (make_key(model_name, mode, params, text), model_name, mode, output, len(output.encode("utf-8")), now, now)
+            for text, output in pairs
+        ]
+        if not rows:
+            return
+        with self._lock:
+            # An upsert, not INSERT OR REPLACE: REPLACE's implicit delete doesn't fire the delete trigger.
+            self._conn.executemany(
+                "INSERT INTO cache_entries (key, model, mode, output, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "output = excluded.output, size = excluded.size, last_used = excluded.last_used",
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        totals = dict(self._conn.execute("SELECT name, value FROM cache_stats WHERE name IN ('entries', 'bytes')"))
+        extra_entries = totals["entries"] - self.max_entries
+        extra_bytes = totals["bytes"] - self.max_bytes if self.max_bytes else 0
+        if extra_entries <= 0 and extra_bytes <= 0:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache_entries ORDER BY last_used"):
+            if extra_entries <= 0 and extra_bytes <= 0:
+                break
+            victims.append(key)
+            extra_entries -= 1
+            extra_bytes -= size
+        for start in range(0, len(victims), 500):
+            chunk = victims[start:start + 500]
+            self._conn.execute(f"DELETE FROM cache_entries WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+        self._bump("evictions", len(victims))
+
+    def stats(self):
+        """Return hit/miss/eviction counters plus current entry count and size."""
+        with self._lock:
+            stats = dict(self._conn.execute("SELECT name, value FROM cache_stats").fetchall())
+        lookups = stats["hits"] + stats["misses"]
+        stats.update(hit_rate=stats["hits"] / lookups if lookups else 0.0)
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.execute("UPDATE cache_stats SET value = 0")
+            self._conn.commit()
+
+    def _bump(self, name, amount):
+        if amount:
+            self._conn.execute("UPDATE cache_stats SET value = value + ? WHERE name = ?", (amount, name))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SimplificationCache()
+        return _cache
+
+
+def cached_generate(model_name, mode, params, texts, generate, cache=None, plain=None):
+    """Look every text up in the cache and run ``generate`` only on the misses.
+
+    ``generate`` receives the list of unique uncached texts and must return
+    their outputs in the same order. Texts are whitespace-normalized before
+    lookup and generation; results come back aligned with ``texts``. Texts
+    for which ``plain(text)`` is true come back unchanged without being
+    looked up, generated or stored.
+    """
+    return cached_generate_modes(
+        model_name, params, {mode: texts},
+        lambda pairs: generate([text for _, text in pairs]), cache, plain,
+    )[mode]
+
+
+def cached_generate_modes(model_name, params, texts_by_mode, generate, cache=None, plain=None):
+    """Like :func:`cached_generate` for several modes, with one ``generate`` call for all their misses.
+
+    ``texts_by_mode`` maps mode -> texts. ``generate`` receives a list of
+    ``(mode, text)`` pairs and returns their outputs in order. Returns
+    ``{mode: outputs aligned with that mode's texts}``.
+    """
+    cache = cache or get_cache()
+    # int8/ONNX outputs can differ slightly from fp32, so they are cached separately.
+    backend = backends.backend_for(model_name)
+    if backend != "torch":
+        model_name = f"{model_name}@{backend}"
+    normalized, passed, found, missing = {}, {}, {}, []
+    for mode, texts in texts_by_mode.items():
+        normalized[mode] = [normalize(t) for t in texts]
+        wanted = list(dict.fromkeys(t for t in normalized[mode] if t))
+        passed[mode] = {t: t for t in wanted if plain(t)} if plain else {}
+        wanted = [t for t in wanted if t not in passed[mode]]
+        found[mode] = cache.get_many(model_name, mode, params, wanted)
+        missing.extend((mode, t) for t in wanted if t not in found[mode])
+    telemetry.add(cache_hits=sum(len(f) for f in found.values()), cache_misses=len(missing))
+    for mode in texts_by_mode:
+        found[mode].update(passed[mode])
+    if missing:
+        outputs = generate(missing)
+        for (mode, text), output in zip(missing, outputs):
+            found[mode][text] = output
+        for mode in texts_by_mode:
+            cache.put_many(model_name, mode, params,
+                           [(text, found[mode][text]) for m, text in missing if m == mode])
+    return {mode: [found[mode].get(t, "") for t in normalized[mode]] for mode in texts_by_mode}
@@ -0,0 +1,74 @@
+"""Clause-aware chunking of contracts under a model token budget."""
+import re
+
+DEFAULT_MAX_TOKENS = 400
+
+# Lines that open a new clause: "1.", "2.3", "(a)", "Section 4", "ARTICLE V", ...
+# A bare number is not a heading: hard-wrapped PDF lines often start with one ("30 days of receipt").
+CLAUSE_START = re.compile(
+    r"^\s*(?:(?:\d+(?:\.\d+)+\.?|\d+\.)\s|\([a-zA-Z0-9]{1,4}\)\s|(?:section|article|clause|schedule)\s+[\dIVXLC]+\b)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def split_clauses(text):
+    """Split ``text`` at numbered clause headings, keeping each heading with its body."""
+    starts = [m.start() for m in CLAUSE_START.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    clauses = []
+    for begin, end in zip(starts, starts[1:] + [len(text)]):
+        clause = text[begin:end].strip()
+        if clause:
+            clauses.append(clause)
+    return clauses
+
+
+def make_counter(tokenizer=None):
+    """Return a function giving the token count of a string (word count without a tokenizer)."""
+    if tokenizer is None:
+        return lambda s: len(s.split())
+    return lambda s: len(tokenizer(s, add_special_tokens=False)["input_ids"])
+
+
+def chunk_text(text, tokenizer=None, max_tokens=DEFAULT_MAX_TOKENS):
+    """Pack sentences into chunks of at most ``max_tokens`` tokens.
+
+    Chunks never span two numbered clauses. Within a clause, whole sentences
+    are packed greedily; a single sentence longer than the budget is split on
+    word boundaries so no input is silently truncated by the model.
+    """
+    from nltk.tokenize import sent_tokenize
+
+    count = make_counter(tokenizer)
+    chunks = []
+    for clause in split_clauses(text):
+        current, used = [], 0
+        for sentence in sent_tokenize(clause):
+            n = count(sentence)
+            pieces = [sentence] if n <= max_tokens else _split_long(sentence, count, max_tokens)
+            for piece in pieces:
+                n = count(piece) if len(pieces) > 1 else n
+                if current and used + n > max_tokens:
+                    chunks.append(" ".join(current))
+                    current, used = [], 0
+                current.append(piece)
+                used += n
+        if current:
+            chunks.append(" ".join(current))
+    return chunks
+
+
+def _split_long(sentence, count, max_tokens):
+    # Word counts are summed rather than re-tokenizing the growing piece.
+    pieces, current, used = [], [], 0
+    for word in sentence.split():
+        n = count(word)
+        if current and used + n > max_tokens:
+            pieces.append(" ".join(current))
+            current, used = [], 0
+        current.append(word)
+        used += n
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
@@ -0,0 +1,114 @@
+"""Command-line entry point: ``python -m cls_core simplify contract.pdf``.
+
+Examples:
+    python -m cls_core simplify contract.pdf
+    python -m cls_core simplify --level Advanced --glossary msa.docx
+    cat clause.txt | python -m cls_core simplify --format jsonl
+    python -m cls_core warmup --model google/flan-t5-base
+    python -m cls_core serve --port 8765 --model tuner007/pegasus_paraphrase
+"""
+import argparse
+import io
+import json
+import os
+import sys
+
+
+def _open_inputs(paths):
+    """Yield ``(name, binary file)`` for each path, reading stdin for ``-`` or no paths."""
+    for path in paths or ["-"]:
+        if path == "-":
+            yield "stdin.txt", io.BytesIO(sys.stdin.buffer.read())
+        else:
+            with open(path, "rb") as f:
+                yield os.path.basename(path), f
+
+
+def _emit(out, fmt, record, text):
+    if fmt == "jsonl":
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    else:
+        out.write(text + "\n")
+    out.flush()
+
+
+def cmd_simplify(args, out=sys.stdout):
+    from cls_core import bootstrap, pipeline, telemetry
+    from cls_core.extract import extract_text
+
+    for problem in bootstrap.ensure():
+        print(problem, file=sys.stderr)
+    for name, f in _open_inputs(args.files):
+        if args.format == "text" and len(args.files) > 1:
+            out.write(f"==> {name} <==\n")
+        with telemetry.trace("cli"):
+            if args.level is None:
+                # Sentences are simplified and written while the file is still being parsed.
+                pairs = pipeline.iter_simplified_file(f, name)
+                for i, (source, simplified) in enumerate(pairs):
+                    _emit(out, args.format, {"file": name, "index": i, "source": source, "simplified": simplified},
+                          simplified)
+                text = None
+            else:
+                text = extract_text(f, name)
+                simplified = pipeline.simplify_level(text, args.level)
+                _emit(out, args.format, {"file": name, "level": args.level, "simplified": simplified}, simplified)
+            if args.glossary:
+                if text is None:
+                    f.seek(0)
+                    text = extract_text(f, name)
+                terms = pipeline.generate_glossary(text)
+                _emit(out, args.format, {"file": name, "glossary": terms},
+                      "\n".join(f"{t}: {d}" for t, d in terms.items()))
+    return 0
+
+
+def cmd_warmup(args, out=sys.stdout):
+    """Fetch NLTK data into the local data dir (and optionally load models) and report timings."""
+    from cls_core import bootstrap
+
+    problems = bootstrap.ensure(models=args.model, background=False)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    bootstrap.ensure()  # a second call shows what a warm page rerun costs
+    out.write(json.dumps(bootstrap.stats(), indent=2) + "\n")
+    return 1 if problems else 0
+
+
+def cmd_serve(args, out=sys.stdout):
+    from cls_core import server
+    server.serve(args.host, args.port, preload=args.model)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cls_core", description="Contract Language Simplifier")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    simplify = sub.add_parser("simplify", help="simplify PDF/DOCX/TXT files or stdin")
+    simplify.add_argument("files", nargs="*", help="input files (default: stdin, read as plain text)")
+    simplify.add_argument("--level", choices=["Basic", "Intermediate", "Advanced"],
+                          help="use multi-level flan-t5 simplification instead of sentence paraphrasing")
+    simplify.add_argument("--glossary", action="store_true", help="also print a glossary of legal terms")
+    simplify.add_argument("--format", choices=["text", "jsonl"], default="text")
+    simplify.set_defaults(func=cmd_simplify)
+
+    warmup = sub.add_parser("warmup", help="download NLTK data into CLS_NLTK_DATA and report startup timings")
+    warmup.add_argument("--model", action="append", default=[], help="also load this registered model (repeatable)")
+    warmup.set_defaults(func=cmd_warmup)
+
+    serve = sub.add_parser("serve", help="run the shared inference server (set CLS_INFERENCE_URL in the app)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--model", action="append", default=[], help="load this model before accepting requests")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
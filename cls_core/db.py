@@ -0,0 +1,276 @@
+"""Pooled connections and schema migrations for the application database (cls_app.db).
+
+:func:`get_conn` hands out a connection from a small pool instead of opening
+a new one per call. Each connection is opened once with WAL journaling (so
+readers never wait behind a writer), the pragmas below and a per-connection
+prepared-statement cache that survives between calls. ``conn.close()``
+returns the connection to the pool, so existing
+``conn = get_conn() ... conn.close()`` code keeps working unchanged.
+
+The whole schema (users, telemetry, glossary, jobs and document versions)
+is listed in ``MIGRATIONS`` and applied in order by :func:`migrate`, tracked
+with ``PRAGMA user_version``. The early steps use ``IF NOT EXISTS``, so
+databases whose tables predate the migrations are adopted as they are.
+Nothing touches the database at import: the file is opened, and pending
+migrations applied, by the first :func:`get_conn` call, so importing
+``cls_core`` (e.g. for the CLI) leaves no database files behind.
+"""
+import os
+import queue
+import sqlite3
+import threading
+
+DB_PATH = os.getenv("CLS_DB_PATH", "cls_app.db")
+POOL_SIZE = int(os.getenv("CLS_DB_POOL_SIZE", "8"))
+BUSY_TIMEOUT = float(os.getenv("CLS_DB_BUSY_TIMEOUT", "5"))  # seconds a writer waits for the lock
+STATEMENT_CACHE = 256
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",  # durable with WAL except on power loss; much cheaper commits
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",  # 8 MB page cache per connection
+)
+
+# (version, script). Append only: never edit a migration that has shipped.
+# Statements are split on ";", so keep semicolons out of string literals.
+MIGRATIONS = [
+    (1, """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
+    """),
+    (2, """
+        CREATE TABLE IF NOT EXISTS request_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            page TEXT NOT NULL,
+            user_id INTEGER,
+            extraction_ms REAL NOT NULL,
+            tokenization_ms REAL NOT NULL,
+            model_ms REAL NOT NULL,
+            total_ms REAL NOT NULL,
+            tokens_in INTEGER NOT NULL,
+            tokens_out INTEGER NOT NULL,
+            cache_hits INTEGER NOT NULL,
+            cache_misses INTEGER NOT NULL,
+            ok INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS request_rollup_hourly (
+            hour TEXT NOT NULL,
+            page TEXT NOT NULL,
+            requests INTEGER NOT NULL,
+            errors INTEGER NOT NULL,
+            extraction_ms REAL NOT NULL,
+            tokenization_ms REAL NOT NULL,
+            model_ms REAL NOT NULL,
+            total_ms REAL NOT NULL,
+            max_total_ms REAL NOT NULL,
+            tokens_in INTEGER NOT NULL,
+            tokens_out INTEGER NOT NULL,
+            cache_hits INTEGER NOT NULL,
+            cache_misses INTEGER NOT NULL,
+            PRIMARY KEY (hour, page)
+        );
+        CREATE TABLE IF NOT EXISTS request_users_hourly (
+            hour TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            PRIMARY KEY (hour, user_id)
+        );
+    """),
+    (3, """
+        CREATE TABLE IF NOT EXISTS glossary (
+            term_key TEXT PRIMARY KEY,
+            term TEXT NOT NULL,
+            definition TEXT NOT NULL,
+            source TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_glossary_source ON glossary (source, term_key);
+    """),
+    (4, """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            name TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            status TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            done INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs (user_id, id);
+        CREATE TABLE IF NOT EXISTS job_chunks (
+            job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+            idx INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            output TEXT,
+            PRIMARY KEY (job_id, idx)
+        );
+    """),
+    (5, """
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            name TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_key ON documents (COALESCE(user_id, -1), name, mode);
+        CREATE TABLE IF NOT EXISTS document_versions (
+            document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+            version INTEGER NOT NULL,
+            sentences INTEGER NOT NULL,
+            reused INTEGER NOT NULL,
+            simplified INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (document_id, version)
+        );
+        CREATE TABLE IF NOT EXISTS version_sentences (
+            document_id INTEGER NOT NULL,
+            version INTEGER NOT NULL,
+            idx INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            output TEXT NOT NULL,
+            PRIMARY KEY (document_id, version, idx),
+            FOREIGN KEY (document_id, version) REFERENCES document_versions(document_id, version) ON DELETE CASCADE
+        );
+    """),
+    # Jobs are owned by an account or by one anonymous session, not by user_id (NULL for every anonymous user).
+    # Older anonymous jobs get no owner, so nobody lists them.
+    (6, """
+        ALTER TABLE jobs ADD COLUMN owner TEXT;
+        UPDATE jobs SET owner = 'user:' || user_id WHERE user_id IS NOT NULL;
+        DROP INDEX IF EXISTS idx_jobs_user;
+        CREATE INDEX idx_jobs_owner ON jobs (owner, id);
+    """),
+    # Document history gets the same owner key. Anonymous history was shared by every anonymous user
+    # under user_id NULL and can't be attributed to anyone, so it is dropped.
+    (7, """
+        ALTER TABLE documents ADD COLUMN owner TEXT;
+        UPDATE documents SET owner = 'user:' || user_id WHERE user_id IS NOT NULL;
+        DELETE FROM documents WHERE owner IS NULL;
+        DROP INDEX IF EXISTS idx_documents_key;
+        CREATE UNIQUE INDEX idx_documents_owner ON documents (owner, name, mode);
+    """),
+    # Revisions may arrive under new file names (MSA_v2.docx, MSA_v3.docx), and outputs are only reusable
+    # under the model settings they were made with. Older versions have no fingerprint, so they are rerun.
+    (8, """
+        ALTER TABLE document_versions ADD COLUMN file_name TEXT;
+        ALTER TABLE document_versions ADD COLUMN fingerprint TEXT;
+    """),
+]
+
+
+class PooledConnection(sqlite3.Connection):
+    """A connection whose ``close()`` hands it back to its pool."""
+
+    pool = None
+
+    def close(self):
+        if self.pool is None or not self.pool.release(self):
+            super().close()
+
+
+class ConnectionPool:
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE, factory=PooledConnection)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        conn.pool = self
+        with self._lock:
+            self.created += 1
+        return conn
+
+    def acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+        with self._lock:
+            self.reused += 1
+        return conn
+
+    def release(self, conn):
+        """Return ``conn`` to the pool; False if the pool is full and it should really close."""
+        if conn.in_transaction:
+            conn.rollback()  # same as closing without commit
+        conn.row_factory = None
+        try:
+            self._idle.put_nowait(conn)
+            return True
+        except queue.Full:
+            conn.pool = None
+            return False
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.pool = None
+            conn.close()
+
+    def stats(self):
+        return {"created": self.created, "reused": self.reused, "idle": self._idle.qsize()}
+
+
+pool = ConnectionPool(DB_PATH)
+_migrated = False
+_migrate_lock = threading.Lock()
+
+
+def get_conn():
+    """Return a pooled connection, bringing the schema up to date on the first one."""
+    global _migrated
+    conn = pool.acquire()
+    if not _migrated:
+        with _migrate_lock:
+            if not _migrated:
+                migrate(conn)
+                _migrated = True
+    return conn
+
+
+def migrate(conn=None):
+    """Apply pending ``MIGRATIONS`` and return the schema version."""
+    own = conn is None
+    conn = conn or get_conn()
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= MIGRATIONS[-1][0]:
+            return MIGRATIONS[-1][0]
+        # IMMEDIATE takes the write lock first, so two processes can't both apply a step.
+        conn.execute("BEGIN IMMEDIATE")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, script in MIGRATIONS:
+            if target > version:
+                for statement in script.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(target)}")
+                version = target
+        conn.commit()
+        return version
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        if own:
+            conn.close()
@@ -0,0 +1,151 @@
+"""Collapse repeated and near-identical sentences so each is simplified once.
+
+Sentences are compared on a canonical form: leading clause numbering
+removed, case folded and whitespace collapsed. Identical canonical forms
+share one model call. That is all the default (``CLS_DEDUP_THRESHOLD=1``)
+does.
+
+Below 1, sentences of at least ``MIN_WORDS`` words are also MinHashed over
+word shingles and bucketed with LSH. A candidate is accepted as a
+near-duplicate when the true Jaccard similarity of its shingles is at least
+the threshold and the two sentences have the same numbers, negations and
+capitalized (defined-term or party) words. One word can flip a clause's
+meaning ("shall not exceed" / "shall exceed", "10,000" / "90,000") while
+barely moving its similarity, so those differences always keep two
+sentences apart.
+
+Each position keeps its own clause number, so "4.2 Notwithstanding the
+foregoing, ..." and "7.1 Notwithstanding the foregoing, ..." come back
+with their own numbering around the one shared simplification.
+"""
+import hashlib
+import os
+import re
+
+THRESHOLD = float(os.getenv("CLS_DEDUP_THRESHOLD", "1"))
+SHINGLE = 3
+MIN_WORDS = 6
+NUM_PERM = 32
+BANDS = 8  # 8 bands x 4 rows: pairs above ~0.6 similarity almost always share a bucket
+
+# "1.", "4.2", "4.2.1." and "(a)" / "a)" / "(iv)"; a bare "30 days" is not numbering.
+_NUMBERING = re.compile(r"^\s*(?:\d+(?:\.\d+)+\.?|\d+\.|\(?[a-zA-Z0-9]{1,4}\))\s+")
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_TERM = re.compile(r"\b[A-Z][\w-]*")
+NEGATIONS = {"not", "no", "never", "nor", "neither", "none", "nothing", "without", "cannot"}
+_MASKS = [int.from_bytes(hashlib.blake2b(str(i).encode(), digest_size=8).digest(), "big") for i in range(NUM_PERM)]
+
+
+def split_numbering(sentence):
+    """Return ``(numbering prefix, body)``."""
+    match = _NUMBERING.match(sentence)
+    if match:
+        return sentence[:match.end()], sentence[match.end():]
+    return "", sentence
+
+
+def canonical(body):
+    return _WHITESPACE.sub(" ", body).strip().casefold()
+
+
+def shingles(text):
+    words = _WORD.findall(text)
+    return {" ".join(words[i:i + SHINGLE]) for i in range(len(words) - SHINGLE + 1)}
+
+
+def meaning_markers(body):
+    """Return what must match exactly for two sentences to be merged: numbers, negations and capitalized words."""
+    words = _WORD.findall(body.casefold())
+    negations = sorted(w for w in words if w in NEGATIONS or w.endswith("n't"))
+    return tuple(_NUMBER.findall(body)), tuple(negations), frozenset(_TERM.findall(body))
+
+
+def minhash(shingle_set):
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingle_set]
+    return [min(h ^ mask for h in hashes) for mask in _MASKS]
+
+
+class DedupPlan:
+    """Maps every input position to one representative sentence sent to the model.
+
+    ``unique`` lists the representatives in first-occurrence order. After
+    simplifying them, :meth:`fan_out` returns one output per input position.
+    """
+
+    def __init__(self, sentences, threshold=THRESHOLD):
+        self.sentences = list(sentences)
+        self.prefixes = []
+        self.index = []  # position -> representative, None for blank sentences
+        self.unique = []
+        self.first = []  # representative -> position of its first occurrence
+        self.exact = 0
+        self.near = 0
+
+        by_text = {}
+        buckets = {}
+        rep_shingles = []
+        rep_markers = []
+        rows = NUM_PERM // BANDS
+        for pos, sentence in enumerate(self.sentences):
+            prefix, body = split_numbering(sentence)
+            self.prefixes.append(prefix)
+            key = canonical(body)
+            if not key:
+                self.index.append(None)
+                continue
+            if key in by_text:
+                self.exact += 1
+                self.index.append(by_text[key])
+                continue
+
+            group = None
+            grams = shingles(key) if threshold < 1 and len(_WORD.findall(key)) >= MIN_WORDS else None
+            markers = meaning_markers(body) if grams else None
+            bands = []
+            if grams:
+                signature = minhash(grams)
+                bands = [(b, tuple(signature[b * rows:(b + 1) * rows])) for b in range(BANDS)]
+                for candidate in dict.fromkeys(c for band in bands for c in buckets.get(band, ())):
+                    other = rep_shingles[candidate]
+                    if rep_markers[candidate] != markers:
+                        continue
+                    if len(grams & other) / len(grams | other) >= threshold:
+                        group = candidate
+                        break
+            if group is not None:
+                self.near += 1
+            else:
+                group = len(self.unique)
+                self.unique.append(body.strip())
+                self.first.append(pos)
+                rep_shingles.append(grams)
+                rep_markers.append(markers)
+                for band in bands:
+                    buckets.setdefault(band, []).append(group)
+            by_text[key] = group
+            self.index.append(group)
+
+    def fan_out(self, outputs):
+        """Return one output per input position from the representatives' ``outputs``."""
+        return [prefix + outputs[group] if group is not None else ""
+                for prefix, group in zip(self.prefixes, self.index)]
+
+    def saved_between(self, start, end):
+        """Model calls saved for positions ``start:end`` (e.g. one document of a bulk run)."""
+        return sum(1 for pos in range(start, end)
+                   if self.index[pos] is not None and self.first[self.index[pos]] != pos)
+
+    def report(self):
+        return {
+            "sentences": len(self.sentences),
+            "model_inputs": len(self.unique),
+            "exact_duplicates": self.exact,
+            "near_duplicates": self.near,
+            "calls_saved": self.exact + self.near,
+        }
+
+
+def plan(sentences, threshold=THRESHOLD):
+    return DedupPlan(sentences, threshold)
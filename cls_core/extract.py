@@ -0,0 +1,102 @@
+"""Streaming text extraction for uploaded PDF, DOCX and TXT contracts."""
+import io
+import re
+
+SUPPORTED_TYPES = ["pdf", "docx", "txt"]
+
+# PdfReader memoizes every object it parses; dropping that cache every few
+# pages keeps memory flat on long PDFs at the cost of re-reading shared fonts.
+PDF_RELEASE_EVERY = 25
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+def file_type(name):
+    return name.split(".")[-1].lower()
+
+
+def iter_pages(file, name=None):
+    """Yield the text of ``file`` one PDF page or DOCX/TXT paragraph at a time.
+
+    ``file`` is any binary file-like object (e.g. a Streamlit upload); ``name``
+    defaults to ``file.name`` and selects the parser by extension.
+    """
+    ext = file_type(name or file.name)
+    if ext == "pdf":
+        return _iter_pdf(file)
+    if ext == "docx":
+        return _iter_docx(file)
+    if ext == "txt":
+        return _iter_txt(file)
+    raise ValueError(f"Unsupported file format: {ext}")
+
+
+def extract_text(file, name=None):
+    """Return the whole text of ``file``, joining PDF pages by a newline and paragraphs by a blank line."""
+    separator = "\n" if file_type(name or file.name) == "pdf" else "\n\n"
+    return separator.join(iter_pages(file, name))
+
+
+def iter_sentences(chunks):
+    """Split a stream of page/paragraph texts into sentences.
+
+    The last sentence of each chunk is held back and joined with the next
+    chunk, so a sentence broken across a page boundary comes out whole.
+    """
+    from nltk.tokenize import sent_tokenize
+
+    carry = ""
+    for chunk in chunks:
+        sentences = sent_tokenize(f"{carry} {chunk}" if carry else chunk)
+        if not sentences:
+            continue
+        yield from sentences[:-1]
+        carry = sentences[-1]
+    if carry:
+        yield carry
+
+
+def _iter_pdf(file):
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file)
+    for i in range(len(reader.pages)):
+        # extract_text() returns None for image-only pages.
+        yield reader.pages[i].extract_text() or ""
+        if (i + 1) % PDF_RELEASE_EVERY == 0:
+            reader.resolved_objects.clear()
+
+
+def _iter_docx(file):
+    import docx2txt
+
+    yield from _split_paragraphs(docx2txt.process(file) or "")
+
+
+def _iter_txt(file):
+    stream = io.TextIOWrapper(file, encoding="utf-8", errors="replace", newline=None)
+    try:
+        paragraph = []
+        for line in stream:
+            if line.strip():
+                paragraph.append(line.rstrip("\n"))
+            elif paragraph:
+                yield "\n".join(paragraph)
+                paragraph = []
+        if paragraph:
+            yield "\n".join(paragraph)
+    finally:
+        # Leave the caller's file open; TextIOWrapper would close it on collection.
+        stream.detach()
+
+
+def _split_paragraphs(text):
+    start = 0
+    for match in _BLANK_LINES.finditer(text):
+        paragraph = text[start:match.start()].strip()
+        if paragraph:
+            yield paragraph
+        start = match.end()
+    paragraph = text[start:].strip()
+    if paragraph:
+        yield paragraph
@@ -0,0 +1,123 @@
+"""Generation policies: length budgets sized to each input, per-level beams and readability skips.
+
+Each call site used to pass one fixed ``max_length`` whatever the input:
+short sentences were given budget they never needed, and long ones were cut
+off. A length policy keeps that figure only as a ceiling. For every batch
+(batches hold inputs of similar length, see :mod:`cls_core.batching`) it
+sets ``max_new_tokens`` from the longest input, ``ratio`` x tokens +
+``slack``, and ``min_new_tokens`` from the shortest, ``min_ratio`` x tokens,
+so an output can't collapse to a fragment either.
+
+Levels decode greedily unless ``CLS_GEN_BEAMS`` (e.g. ``Advanced=4``) gives
+one a beam width. Text whose Flesch-Kincaid grade is already at or below
+``CLS_GEN_SKIP_GRADE`` is returned as is, without a model call or a cache
+entry.
+
+:func:`stats` counts decode steps saved against the old fixed budgets: the
+budget trimmed from every generated row, plus the whole budget of every
+skipped one. These are steps no longer allotted; a row that reached its end
+of sequence early never used them anyway, so it is an upper bound on
+decoding time saved.
+"""
+import math
+import os
+import threading
+
+ADAPTIVE = os.getenv("CLS_GEN_ADAPTIVE", "1") != "0"
+SKIP_GRADE = float(os.getenv("CLS_GEN_SKIP_GRADE", "6"))
+
+# Output tokens allowed per input token, plus a fixed allowance for short inputs.
+POLICIES = {
+    "paraphrase": {"ratio": 1.5, "slack": 8, "min_ratio": 0.5},
+    "simplify": {"ratio": 1.0, "slack": 32, "min_ratio": 0.2},
+    "level": {"ratio": 1.2, "slack": 16, "min_ratio": 0.3},
+}
+
+
+def _parse_beams(value):
+    beams = {}
+    for item in value.split(","):
+        if "=" in item:
+            level, width = item.rsplit("=", 1)
+            beams[level.strip()] = int(width)
+    return beams
+
+
+BEAMS = _parse_beams(os.getenv("CLS_GEN_BEAMS", ""))
+
+_stats = {"batches": 0, "rows": 0, "skipped": 0, "decode_steps_saved": 0}
+_lock = threading.Lock()
+
+
+def _record(**counts):
+    with _lock:
+        for name, value in counts.items():
+            _stats[name] += value
+
+
+def with_policy(params, policy, level=None):
+    """Return ``params`` with length policy ``policy`` attached, and ``level``'s beam width if it has one.
+
+    The policy travels inside the params (they are JSON, so it reaches the
+    inference server too) and is turned into per-batch limits by :func:`resolve`.
+    """
+    params = dict(params)
+    if ADAPTIVE:
+        params["length_policy"] = POLICIES[policy]
+    if level in BEAMS:
+        params["num_beams"] = BEAMS[level]
+    return params
+
+
+def resolve(lengths, params):
+    """Turn ``params`` into generation kwargs for one batch whose inputs have ``lengths`` tokens."""
+    params = dict(params)
+    policy = params.pop("length_policy", None)
+    if policy is None or not lengths:
+        return params
+    ceiling = params.pop("max_length", None)
+    max_new = math.ceil(max(lengths) * policy["ratio"]) + policy["slack"]
+    if ceiling:
+        max_new = min(max_new, ceiling)
+    params["max_new_tokens"] = max_new
+    params["min_new_tokens"] = min(int(min(lengths) * policy["min_ratio"]), max_new)
+    _record(batches=1, rows=len(lengths), decode_steps_saved=max((ceiling or max_new) - max_new, 0) * len(lengths))
+    return params
+
+
+def grade(text):
+    """Flesch-Kincaid grade of ``text`` from the readability engine's memoized sentence counts."""
+    from nltk.tokenize import sent_tokenize
+
+    from cls_core import readability
+
+    words = syllable_total = sentences = 0
+    for sentence in sent_tokenize(text):
+        w, s, _ = readability.sentence_counts(sentence)
+        words, syllable_total, sentences = words + w, syllable_total + s, sentences + 1
+    return readability.flesch_kincaid(words, sentences, syllable_total)
+
+
+def plain_check(params=None, threshold=SKIP_GRADE):
+    """Return ``is_plain(text)``: True when ``text`` is at or below ``threshold`` grade and needs no model call.
+
+    Pass it to :func:`cls_core.cache.cached_generate` as ``plain``, so plain
+    text is passed through before the cache and never stored there (a
+    stored copy would outlive a change of ``CLS_GEN_SKIP_GRADE``).
+    ``params`` (the ones the model would have run with) size the budget
+    counted as saved for each text skipped.
+    """
+    budget = (params or {}).get("max_length", 0)
+
+    def is_plain(text):
+        if grade(text) > threshold:
+            return False
+        _record(skipped=1, decode_steps_saved=budget)
+        return True
+
+    return is_plain
+
+
+def stats():
+    with _lock:
+        return dict(_stats, adaptive=ADAPTIVE, skip_grade=SKIP_GRADE, beams=dict(BEAMS))
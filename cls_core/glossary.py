@@ -0,0 +1,219 @@
+"""Glossary term extraction, a persistent definition store and one-pass highlighting.
+
+Terms live in the ``glossary`` table of cls_app.db, keyed by their case-folded
+form. Admin-curated terms (``source='admin'``) are also kept in an in-memory
+word trie, updated on every edit, so pages can find them in a document in a
+single scan without asking the model.
+"""
+import csv
+import io
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+
+from cls_core.db import get_conn
+
+MAX_TERMS = 10
+LEGAL_TERMS = {"agreement", "employer", "employee", "termination", "liability"}
+
+_CANDIDATE = re.compile(r"\b[A-Z][a-z]+\b")
+_WORD = re.compile(r"\w+(?:[-']\w+)*")
+_END = ""  # trie key marking the last word of a term; never produced by _WORD
+
+
+def term_key(term):
+    return term.casefold()
+
+
+def extract_terms(text, limit=MAX_TERMS):
+    """Return up to ``limit`` capitalized legal-looking terms, most frequent first.
+
+    Ties keep first-appearance order, so the same text always yields the same terms.
+    """
+    counts = Counter(_CANDIDATE.findall(text))
+    important = [t for t in counts if len(t) > 6 or t.lower() in LEGAL_TERMS]
+    important.sort(key=lambda t: -counts[t])  # stable: equal counts stay in text order
+    return important[:limit]
+
+
+def lookup(terms):
+    """Return ``{term: definition}`` for the terms already in the store (case-insensitive)."""
+    keys = {term_key(t): t for t in terms}
+    if not keys:
+        return {}
+    conn = get_conn()
+    rows = conn.execute(
+        f"SELECT term_key, definition FROM glossary WHERE term_key IN ({','.join('?' * len(keys))})", list(keys)
+    ).fetchall()
+    conn.close()
+    return {keys[key]: definition for key, definition in rows}
+
+
+def save(definitions, source="model"):
+    """Store ``{term: definition}``; model output never replaces an existing definition."""
+    verb = "INSERT OR IGNORE" if source == "model" else "INSERT OR REPLACE"
+    now = datetime.utcnow().isoformat()
+    conn = get_conn()
+    conn.executemany(
+        f"{verb} INTO glossary (term_key, term, definition, source, updated_at) VALUES (?, ?, ?, ?, ?)",
+        [(term_key(t), t, d, source, now) for t, d in definitions.items()],
+    )
+    conn.commit()
+    conn.close()
+    if source == "admin" and _matcher is not None:
+        with _matcher_lock:
+            for t in definitions:
+                _matcher.add(t)
+
+
+def delete(term):
+    conn = get_conn()
+    conn.execute("DELETE FROM glossary WHERE term_key=?", (term_key(term),))
+    conn.commit()
+    conn.close()
+    if _matcher is not None:
+        with _matcher_lock:
+            _matcher.remove(term)
+
+
+def list_terms(source=None):
+    """Return ``(term, definition, source)`` rows ordered by term."""
+    conn = get_conn()
+    if source is None:
+        rows = conn.execute("SELECT term, definition, source FROM glossary ORDER BY term_key").fetchall()
+    else:
+        rows = conn.execute("SELECT term, definition, source FROM glossary WHERE source=? ORDER BY term_key",
+                            (source,)).fetchall()
+    conn.close()
+    return rows
+
+
+def import_csv(file, source="admin"):
+    """Bulk-load a CSV with ``term`` and ``definition`` columns in one transaction; return the row count."""
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    definitions = {}
+    for row in reader:
+        term = (row.get("term") or "").strip()
+        definition = (row.get("definition") or "").strip()
+        if term and definition:
+            definitions[term] = definition
+    save(definitions, source=source)
+    return len(definitions)
+
+
+def export_csv(source=None):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["term", "definition", "source"])
+    writer.writerows(list_terms(source))
+    return out.getvalue()
+
+
+def define_terms(terms, generate):
+    """Return definitions for ``terms``, generating only the ones not yet stored.
+
+    ``generate`` receives every new term at once (so they share one batched
+    forward pass) and returns their definitions in the same order.
+    """
+    known = lookup(terms)
+    missing = [t for t in terms if t not in known]
+    if missing:
+        generated = dict(zip(missing, generate(missing)))
+        save(generated)
+        known.update(generated)
+    return {t: known[t] for t in terms}
+
+
+@lru_cache(maxsize=256)
+def _term_pattern(terms):
+    # Longest first so "Termination Date" wins over "Termination".
+    alternation = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b({alternation})\b", re.IGNORECASE)
+
+
+def highlight(text, terms):
+    """Bold every occurrence of ``terms`` in ``text`` with a single regex pass."""
+    terms = tuple(sorted(set(terms)))
+    if not terms:
+        return text
+    return _term_pattern(terms).sub(r"**\1**", text)
+
+
+def _words(text):
+    return [w.casefold() for w in _WORD.findall(text)]
+
+
+class TermMatcher:
+    """Word-level trie of glossary terms.
+
+    :meth:`find` walks the text once; at each word it follows the trie only
+    as deep as the longest term, so matching cost does not grow with the
+    number of terms.
+    """
+
+    def __init__(self, terms=()):
+        self._root = {}
+        for term in terms:
+            self.add(term)
+
+    def add(self, term):
+        words = _words(term)
+        if not words:
+            return
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        node[_END] = term
+
+    def remove(self, term):
+        path, node = [], self._root
+        for word in _words(term):
+            if word not in node:
+                return
+            path.append((node, word))
+            node = node[word]
+        node.pop(_END, None)
+        # Prune branches that no longer lead to any term.
+        for parent, word in reversed(path):
+            if parent[word]:
+                break
+            del parent[word]
+
+    def find(self, text):
+        """Return ``(start, end, term)`` for each longest, non-overlapping match in ``text``."""
+        tokens = [(m.start(), m.end(), m.group().casefold()) for m in _WORD.finditer(text)]
+        matches, i = [], 0
+        while i < len(tokens):
+            node, j, best = self._root, i, None
+            while j < len(tokens) and tokens[j][2] in node:
+                node = node[tokens[j][2]]
+                j += 1
+                if _END in node:
+                    best = (j, node[_END])
+            if best:
+                matches.append((tokens[i][0], tokens[best[0] - 1][1], best[1]))
+                i = best[0]
+            else:
+                i += 1
+        return matches
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher():
+    """Return the process-wide matcher of admin-curated terms, building it on first use."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = TermMatcher(term for term, _, _ in list_terms("admin"))
+        return _matcher
+
+
+def match_terms(text):
+    """Return ``{term: definition}`` for admin-curated terms that occur in ``text``."""
+    found = list(dict.fromkeys(term for _, _, term in get_matcher().find(text)))
+    return lookup(found)
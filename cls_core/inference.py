@@ -0,0 +1,80 @@
+"""Run a generation model in this process, or on the shared inference server.
+
+When ``CLS_INFERENCE_URL`` is set (e.g. ``http://127.0.0.1:8765``, see
+:mod:`cls_core.server`), :func:`generate` posts texts to that server, which
+batches requests from every session onto one loaded copy of each model.
+Otherwise the model is loaded here through the registry, as before. Callers
+don't need to know which is in use.
+"""
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from functools import lru_cache
+
+from cls_core import telemetry
+from cls_core.batching import simplify_batched
+from cls_core.registry import get_model
+
+INFERENCE_URL = os.getenv("CLS_INFERENCE_URL", "").rstrip("/")
+TIMEOUT = float(os.getenv("CLS_INFERENCE_TIMEOUT", "300"))
+RETRIES = 5
+REQUEST_CHUNK = 256  # texts per request; keep under the server's CLS_SERVE_MAX_PER_USER
+
+
+class ServerBusy(RuntimeError):
+    """The inference server kept rejecting the request because its queue was full."""
+
+
+def generate(model_name, texts, **params):
+    """Return one generated string per text, in order."""
+    texts = list(texts)
+    if not texts:
+        return []
+    if not INFERENCE_URL:
+        return simplify_batched(get_model(model_name), texts, **params)
+    outputs = []
+    with telemetry.span("model"):
+        for start in range(0, len(texts), REQUEST_CHUNK):
+            body = {"model": model_name, "texts": texts[start:start + REQUEST_CHUNK], "params": params,
+                    "owner": telemetry.current_owner()}
+            outputs.extend(_request("/generate", body)["outputs"])
+    return outputs
+
+
+def get_tokenizer(model_name):
+    """Return the model's tokenizer without loading the model weights when they live on the server."""
+    if not INFERENCE_URL:
+        return get_model(model_name).tokenizer
+    return _remote_tokenizer(model_name)
+
+
+@lru_cache(maxsize=None)
+def _remote_tokenizer(model_name):
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(model_name)
+
+
+def server_stats():
+    """Return the inference server's queue and batch statistics, or None when running in-process."""
+    if not INFERENCE_URL:
+        return None
+    return _request("/stats")
+
+
+def _request(path, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    for attempt in range(RETRIES):
+        request = urllib.request.Request(INFERENCE_URL + path, data=data,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                detail = e.read().decode("utf-8", "replace")
+                raise RuntimeError(f"Inference server error {e.code}: {detail}") from e
+            # Backpressure: the server's queue is full, so wait as long as it asks.
+            time.sleep(float(e.headers.get("Retry-After", 1)) * (attempt + 1))
+    raise ServerBusy(f"Inference server at {INFERENCE_URL} is overloaded; try again shortly.")
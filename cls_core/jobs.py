@@ -0,0 +1,168 @@
+"""Background simplification jobs with per-chunk checkpoints in cls_app.db.
+
+A job is a document split into chunks (usually sentences) plus a mode that
+names the handler used to simplify them. Jobs run on an in-process worker
+pool, so they survive browser refreshes and reruns; outputs are committed
+every few chunks, so a job interrupted by a crash resumes where it stopped
+once its handler is registered again.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from cls_core import telemetry
+from cls_core.db import get_conn
+
+MAX_WORKERS = int(os.getenv("CLS_JOB_WORKERS", "4"))
+# Jobs allowed to run inference on the same model at once.
+PER_MODEL_CONCURRENCY = int(os.getenv("CLS_JOB_MODEL_CONCURRENCY", "1"))
+CHECKPOINT_EVERY = int(os.getenv("CLS_JOB_CHECKPOINT_EVERY", "16"))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="cls-job")
+_handlers = {}
+_model_slots = {}
+_lock = threading.Lock()
+
+
+def _now():
+    return datetime.utcnow().isoformat()
+
+
+def register_handler(mode, model_name, handler):
+    """Register ``handler(chunks) -> outputs`` for ``mode`` and resume its interrupted jobs.
+
+    Jobs of one mode share a concurrency slot pool keyed by ``model_name``.
+    """
+    with _lock:
+        first = mode not in _handlers
+        _handlers[mode] = (model_name, handler)
+        _model_slots.setdefault(model_name, threading.BoundedSemaphore(PER_MODEL_CONCURRENCY))
+    if first:
+        resume_pending(mode)
+
+
+def submit(owner, name, mode, chunks, user_id=None):
+    """Queue ``chunks`` for simplification in ``mode`` and return the new job id.
+
+    ``owner`` is the key the job is listed and downloaded under: ``user:<id>``
+    for an account, or a per-session key for anonymous visitors. ``user_id``
+    is only recorded for telemetry.
+    """
+    if mode not in _handlers:
+        raise KeyError(f"No handler registered for mode: {mode}")
+    chunks = list(chunks)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT INTO jobs (user_id, owner, name, mode, status, total, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (user_id, owner, name, mode, QUEUED, len(chunks), _now(), _now()),
+    )
+    job_id = cur.lastrowid
+    cur.executemany("INSERT INTO job_chunks (job_id, idx, source) VALUES (?, ?, ?)",
+                    [(job_id, i, chunk) for i, chunk in enumerate(chunks)])
+    conn.commit()
+    conn.close()
+    _executor.submit(_run, job_id)
+    return job_id
+
+
+def cancel(job_id, owner):
+    """Stop ``owner``'s queued or running job after its current checkpoint."""
+    conn = get_conn()
+    conn.execute("UPDATE jobs SET status=?, updated_at=? WHERE id=? AND owner=? AND status IN (?, ?)",
+                 (CANCELLED, _now(), job_id, owner, QUEUED, RUNNING))
+    conn.commit()
+    conn.close()
+
+
+def get_job(job_id, owner):
+    """Return ``owner``'s job row as a dict, or None (also for another owner's job)."""
+    conn = get_conn()
+    conn.row_factory = _dict_row
+    job = conn.execute("SELECT * FROM jobs WHERE id=? AND owner=?", (job_id, owner)).fetchone()
+    conn.close()
+    return job
+
+
+def list_jobs(owner, limit=20):
+    conn = get_conn()
+    conn.row_factory = _dict_row
+    rows = conn.execute("SELECT * FROM jobs WHERE owner=? ORDER BY id DESC LIMIT ?", (owner, limit)).fetchall()
+    conn.close()
+    return rows
+
+
+def job_results(job_id, owner):
+    """Return ``(source, output)`` pairs of ``owner``'s job in document order; output is None until processed.
+
+    Another owner's job id gives no rows.
+    """
+    conn = get_conn()
+    rows = conn.execute(
+        "SELECT c.source, c.output FROM job_chunks c JOIN jobs j ON j.id = c.job_id "
+        "WHERE c.job_id=? AND j.owner=? ORDER BY c.idx", (job_id, owner)).fetchall()
+    conn.close()
+    return rows
+
+
+def resume_pending(mode):
+    """Requeue ``mode`` jobs left queued or running by a previous process."""
+    conn = get_conn()
+    ids = [row[0] for row in conn.execute(
+        "SELECT id FROM jobs WHERE mode=? AND status IN (?, ?) ORDER BY id", (mode, QUEUED, RUNNING))]
+    conn.close()
+    for job_id in ids:
+        _executor.submit(_run, job_id)
+    return ids
+
+
+def _dict_row(cursor, row):
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+def _status(conn, job_id):
+    row = conn.execute("SELECT status FROM jobs WHERE id=?", (job_id,)).fetchone()
+    return row[0] if row else None
+
+
+def _run(job_id):
+    conn = get_conn()
+    try:
+        row = conn.execute("SELECT mode, status, user_id, owner FROM jobs WHERE id=?", (job_id,)).fetchone()
+        if row is None or row[1] not in (QUEUED, RUNNING):
+            return
+        model_name, handler = _handlers[row[0]]
+        conn.execute("UPDATE jobs SET status=?, updated_at=? WHERE id=?", (RUNNING, _now(), job_id))
+        conn.commit()
+        with telemetry.trace(f"{row[0]}-job", row[2], row[3]):
+            _process(conn, job_id, model_name, handler)
+    except Exception as e:
+        conn.execute("UPDATE jobs SET status=?, error=?, updated_at=? WHERE id=?", (FAILED, str(e), _now(), job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _process(conn, job_id, model_name, handler):
+    while True:
+        if _status(conn, job_id) != RUNNING:
+            return
+        pending = conn.execute(
+            "SELECT idx, source FROM job_chunks WHERE job_id=? AND output IS NULL ORDER BY idx LIMIT ?",
+            (job_id, CHECKPOINT_EVERY),
+        ).fetchall()
+        if not pending:
+            break
+        # Slots are held per checkpoint, not per job, so concurrent jobs interleave.
+        with _model_slots[model_name]:
+            outputs = handler([source for _, source in pending])
+        conn.executemany("UPDATE job_chunks SET output=? WHERE job_id=? AND idx=?",
+                         [(out, job_id, idx) for (idx, _), out in zip(pending, outputs)])
+        conn.execute("UPDATE jobs SET done=done+?, updated_at=? WHERE id=?", (len(pending), _now(), job_id))
+        conn.commit()
+    conn.execute("UPDATE jobs SET status=?, updated_at=? WHERE id=? AND status=?", (DONE, _now(), job_id, RUNNING))
+    conn.commit()
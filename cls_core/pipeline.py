@@ -0,0 +1,263 @@
+"""Headless simplification pipeline: extractor -> sentence splitter -> batched simplifier -> glossary.
+
+Everything the Simplify and MultiLevel pages do, callable without Streamlit.
+Importing this module is cheap: torch/transformers, spaCy and NLTK are only
+imported when a model or tokenizer is first needed.
+"""
+import hashlib
+import json
+import time
+
+from cls_core import backends, dedup, generation
+from cls_core import glossary as glossary_store
+from cls_core import telemetry
+from cls_core.batching import DEFAULT_STREAM_WINDOW, iter_windows, make_batches
+from cls_core.cache import cached_generate, cached_generate_modes
+from cls_core.chunking import chunk_text
+from cls_core.extract import iter_pages, iter_sentences
+from cls_core.inference import generate, get_tokenizer
+from cls_core.tasks import TaskGraph
+
+# ====== SENTENCE PARAPHRASE (Simplify page) ======
+PARAPHRASE_MODEL = "tuner007/pegasus_paraphrase"
+# max_length is a ceiling: each batch's budget is sized to its inputs (cls_core.generation).
+PARAPHRASE_PARAMS = generation.with_policy({"max_length": 100, "num_return_sequences": 1}, "paraphrase")
+
+# ====== WHOLE-TEXT SIMPLIFICATION (Text Analysis page) ======
+ANALYSIS_MODEL = "t5-base"
+# Was a fixed 200, which cut long documents off; short ones now stop far earlier.
+ANALYSIS_PARAMS = generation.with_policy({"max_length": 512, "do_sample": False}, "simplify")
+
+# ====== MULTI-LEVEL SIMPLIFICATION (MultiLevel page) ======
+LEVEL_MODEL = "google/flan-t5-base"
+LEVEL_PARAMS = {"max_length": 500, "do_sample": False}  # see level_params()
+CHUNK_TOKENS = 400  # flan-t5 reads 512 tokens; leave room for the instruction prompt
+LEVELS = ["Basic", "Intermediate", "Advanced"]
+PROMPTS = {
+    "Basic": "Simplify this legal text slightly for clarity:\n{text}",
+    "Intermediate": "Rephrase this legal contract in simpler, non-technical English:\n{text}",
+    "Advanced": "Rewrite this legal document in very simple, everyday language:\n{text}"
+}
+
+# ====== GLOSSARY ======
+GLOSSARY_PARAMS = {"max_length": 50}
+GLOSSARY_PROMPT = "Explain the legal term '{term}' in one short sentence."
+
+
+def split_sentences(text):
+    from nltk.tokenize import sent_tokenize
+    return sent_tokenize(text)
+
+
+def simplify_batch(sentences):
+    """Paraphrase sentences in length-bucketed batches, skipping any already cached or already plain."""
+    return cached_generate(
+        PARAPHRASE_MODEL, "paraphrase", PARAPHRASE_PARAMS, sentences,
+        lambda batch: generate(PARAPHRASE_MODEL, batch, **PARAPHRASE_PARAMS),
+        plain=generation.plain_check(PARAPHRASE_PARAMS),
+    )
+
+
+def paraphrase_fingerprint():
+    """Hash of everything a paraphrase output depends on besides its sentence.
+
+    That is the model, its backend, the generation params, the plain-text
+    skip grade and the dedup threshold. Stored outputs made under another
+    fingerprint are out of date (see :func:`cls_core.versions.resimplify`).
+    """
+    settings = [PARAPHRASE_MODEL, backends.backend_for(PARAPHRASE_MODEL), PARAPHRASE_PARAMS,
+                generation.SKIP_GRADE, dedup.THRESHOLD]
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def simplify_plan(plan):
+    """Simplify a :class:`~cls_core.dedup.DedupPlan`'s representatives and fan them out."""
+    return plan.fan_out(simplify_batch(plan.unique))
+
+
+def simplify_sentences(sentences):
+    """Paraphrase sentences, simplifying repeated and near-identical ones once."""
+    return simplify_plan(dedup.plan(sentences))
+
+
+def iter_simplified(plan, window=DEFAULT_STREAM_WINDOW):
+    """Yield ``(source, simplified)`` in document order, simplifying ``window`` representatives at a time.
+
+    A position is yielded as soon as its representative is done, so repeats
+    of earlier sentences come out without waiting for another model call.
+    """
+    done, pos = [], 0
+    for _, batch in iter_windows(plan.unique, window):
+        done.extend(simplify_batch(batch))
+        while pos < len(plan.sentences) and (plan.index[pos] is None or plan.index[pos] < len(done)):
+            group = plan.index[pos]
+            yield plan.sentences[pos], plan.prefixes[pos] + done[group] if group is not None else ""
+            pos += 1
+    for sentence in plan.sentences[pos:]:  # only when every sentence was blank
+        yield sentence, ""
+
+
+def simplify_text(text):
+    """Split text into sentences, paraphrase them, and join them."""
+    return " ".join(simplify_sentences(split_sentences(text)))
+
+
+def iter_simplified_file(file, name=None):
+    """Yield ``(source, simplified)`` sentence pairs while ``file`` is still being read."""
+    for _, window in iter_windows(iter_sentences(iter_pages(file, name))):
+        yield from zip(window, simplify_sentences(window))
+
+
+def simplify_document(text):
+    """Simplify a whole text in one T5 call, as the Text Analysis page does."""
+    return cached_generate(
+        ANALYSIS_MODEL, "simplify", ANALYSIS_PARAMS, [text],
+        lambda batch: generate(ANALYSIS_MODEL, [f"simplify: {t}" for t in batch], **ANALYSIS_PARAMS),
+    )[0]
+
+
+def clean_text(text):
+    """Lowercase, strip punctuation and drop stopwords (the Text Analysis preprocessing)."""
+    from cls_core import preprocess
+    with telemetry.span("tokenization"):
+        return preprocess.clean_text(text)
+
+
+def score_text(text):
+    """Return ``(document scores, score table)``; the table scores every clause and sentence from one pass."""
+    from cls_core import readability
+    score_table = readability.analyze(text)
+    return readability.document_scores(score_table), score_table
+
+
+def analyze_text(text):
+    """Return ``(cleaned, scores, score_table, simplified)``, everything the Text Analysis page shows."""
+    return (clean_text(text), *score_text(text), simplify_document(text))
+
+
+def level_chunks(text):
+    """Split ``text`` into clause-aligned chunks that fit the level model's context."""
+    with telemetry.span("tokenization"):
+        return chunk_text(text, get_tokenizer(LEVEL_MODEL), max_tokens=CHUNK_TOKENS)
+
+
+def level_params(level):
+    """Generation params for ``level``: an input-sized budget, and its beam width if ``CLS_GEN_BEAMS`` sets one."""
+    return generation.with_policy(LEVEL_PARAMS, "level", level)
+
+
+def simplify_chunks(chunks, level):
+    """Simplify ``chunks`` at ``level`` as one batch and stitch them back; chunks already plain are kept."""
+    params = level_params(level)
+    outputs = cached_generate(
+        LEVEL_MODEL, level, params, chunks,
+        lambda batch: generate(LEVEL_MODEL, [PROMPTS[level].format(text=t) for t in batch], **params),
+        plain=generation.plain_check(params),
+    )
+    return "\n\n".join(outputs)
+
+
+def simplify_chunks_levels(chunks, levels=LEVELS):
+    """Simplify ``chunks`` at each of ``levels`` in one batched pass.
+
+    The prompts of every level for each chunk are sent to the model together,
+    so they share batches instead of each level paying for its own. (A level
+    configured with its own beam width runs in a pass of its own.) Chunks
+    already plain are kept as they are at every level. Returns
+    ``({level: text}, report)``; ``report`` counts the prompts and batches
+    run, and the batches separate single-level runs would have needed.
+    """
+    started = time.perf_counter()
+    prompts, outputs = [], {}
+    # Levels share a pass when they decode alike; one given its own beam width gets its own pass.
+    passes = {}
+    for level in levels:
+        passes.setdefault(json.dumps(level_params(level), sort_keys=True), []).append(level)
+    for group, group_levels in enumerate(passes.values()):
+        params = level_params(group_levels[0])
+
+        def generate_prompts(pairs, params=params, group=group):
+            batch = [(group, level, PROMPTS[level].format(text=t)) for level, t in pairs]
+            prompts.extend(batch)
+            return generate(LEVEL_MODEL, [prompt for _, _, prompt in batch], **params)
+
+        outputs.update(cached_generate_modes(
+            LEVEL_MODEL, params, {level: chunks for level in group_levels}, generate_prompts,
+            plain=generation.plain_check(params),
+        ))
+    seconds = time.perf_counter() - started
+
+    combined = separate = 0
+    if prompts:
+        with telemetry.span("tokenization"):
+            encoded = get_tokenizer(LEVEL_MODEL)([prompt for _, _, prompt in prompts], add_special_tokens=True)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        # Passes never share batches, so count each one's batches on its own.
+        combined = sum(len(make_batches([n for (g, _, _), n in zip(prompts, lengths) if g == group]))
+                       for group in range(len(passes)))
+        separate = sum(len(make_batches([n for (_, l, _), n in zip(prompts, lengths) if l == level]))
+                       for level in levels)
+    report = {
+        "levels": list(levels),
+        "chunks": len(chunks),
+        "prompts": len(prompts),
+        "batches": combined,
+        "separate_batches": separate,
+        "seconds": seconds,
+    }
+    return {level: "\n\n".join(outputs[level]) for level in levels}, report
+
+
+def simplify_level(text, level):
+    return simplify_chunks(level_chunks(text), level)
+
+
+def multilevel_graph(text, level=None, other_levels=True):
+    """Return the MultiLevel page's stages as a :class:`~cls_core.tasks.TaskGraph`.
+
+    Chunking -> simplification and term extraction -> glossary definitions
+    are independent branches, so they run side by side. The simplification
+    stage covers ``level``, or every level in one pass if ``level`` is None.
+    With ``other_levels``, an "Other levels" stage then simplifies the
+    remaining levels, after ``level`` so it doesn't compete with it for the
+    model. Simplification stages return ``({level: text}, report)`` and the
+    glossary stage ``{term: definition}``.
+    """
+    first = [level] if level else list(LEVELS)
+    rest = [other for other in LEVELS if other not in first] if other_levels else []
+    graph = TaskGraph()
+    graph.add("Chunking", lambda: level_chunks(text))
+    graph.add("Simplification", lambda chunks: simplify_chunks_levels(chunks, first), "Chunking")
+    if rest:
+        graph.add("Other levels", lambda chunks, _: simplify_chunks_levels(chunks, rest), "Chunking", "Simplification")
+    graph.add("Term extraction", lambda: find_glossary_terms(text))
+    graph.add("Glossary definitions", lambda found: define_glossary_terms(*found), "Term extraction")
+    return graph
+
+
+def find_glossary_terms(text):
+    """Return ``(curated, terms)``: admin definitions found in ``text`` and other candidate terms."""
+    curated = glossary_store.match_terms(text)
+    covered = {glossary_store.term_key(t) for t in curated}
+    terms = [t for t in glossary_store.extract_terms(text) if glossary_store.term_key(t) not in covered]
+    return curated, terms
+
+
+def define_glossary_terms(curated, terms):
+    """Add definitions for ``terms``, reusing stored ones and generating the rest in one batch."""
+    # The model is only loaded if some term has no stored definition yet.
+    generated = glossary_store.define_terms(
+        terms,
+        lambda batch: generate(LEVEL_MODEL, [GLOSSARY_PROMPT.format(term=t) for t in batch], **GLOSSARY_PARAMS),
+    )
+    return {**curated, **generated}
+
+
+def generate_glossary(text):
+    """Return ``{term: definition}`` for the legal terms in ``text``.
+
+    Admin-curated terms are matched directly. Of the remaining capitalized
+    legal-looking terms, stored definitions are reused and new terms are
+    defined together in one batched forward pass.
+    """
+    return define_glossary_terms(*find_glossary_terms(text))
@@ -0,0 +1,45 @@
+"""Text cleaning for analysis: lowercase, strip punctuation, drop stopwords."""
+import re
+import threading
+
+_NON_ALNUM = re.compile(r"[^a-zA-Z0-9\s]")
+
+_stopwords = None
+_stopwords_lock = threading.Lock()
+
+
+def stopword_set():
+    """Return NLTK's English stopwords as a frozenset, read from disk once per process."""
+    global _stopwords
+    with _stopwords_lock:
+        if _stopwords is None:
+            from nltk.corpus import stopwords
+            _stopwords = frozenset(stopwords.words("english"))
+        return _stopwords
+
+
+def _nltk_tokens(texts):
+    from nltk.tokenize import word_tokenize
+    return (word_tokenize(t) for t in texts)
+
+
+def _spacy_tokens(texts, nlp, batch_size):
+    # Only the tokenizer runs; tagger/parser/NER are not needed for cleaning.
+    for doc in nlp.tokenizer.pipe(texts, batch_size=batch_size):
+        yield [tok.text for tok in doc if not tok.is_space]
+
+
+def clean_many(texts, nlp=None, batch_size=64):
+    """Clean many documents in one call.
+
+    Tokenizes with NLTK's ``word_tokenize`` by default, or with the tokenizer
+    of an already loaded spaCy pipeline when ``nlp`` is given.
+    """
+    stop = stopword_set()
+    lowered = [_NON_ALNUM.sub("", t.lower()) for t in texts]
+    token_lists = _nltk_tokens(lowered) if nlp is None else _spacy_tokens(lowered, nlp, batch_size)
+    return [" ".join(w for w in tokens if w not in stop) for tokens in token_lists]
+
+
+def clean_text(text, nlp=None):
+    return clean_many([text], nlp)[0]
@@ -0,0 +1,118 @@
+"""Document-, section- and sentence-level readability from one pass of counts.
+
+Each sentence is tokenized and syllable-counted once (and memoized, so
+boilerplate repeated across contracts is counted once per process). Section
+and document scores are computed by summing those counts, never by
+rescanning text.
+
+Flesch-Kincaid grade uses the standard formula. Gunning Fog counts every
+word of three or more syllables as complex (the classic definition), so it
+runs slightly higher than textstat's variant, which exempts common words.
+"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from cls_core.chunking import split_clauses
+
+_WORD = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*|\d+(?:[.,]\d+)*")
+# Clause numbers ("4.2", "(b)") would otherwise be scored as one-word sentences.
+_NUMBERING = re.compile(r"^\s*(?:\d+(?:\.\d+)*\.?|\([a-zA-Z0-9]{1,4}\))\s+")
+
+
+@lru_cache(maxsize=200000)
+def syllables(word):
+    from textstat import syllable_count
+    return syllable_count(word) or 1
+
+
+@lru_cache(maxsize=50000)
+def sentence_counts(sentence):
+    """Return ``(words, syllables, complex_words)`` for one sentence."""
+    words = _WORD.findall(sentence)
+    counts = [syllables(w.lower()) for w in words]
+    return len(words), sum(counts), sum(1 for c in counts if c >= 3)
+
+
+def flesch_kincaid(words, sentences, syllable_total):
+    if not words or not sentences:
+        return 0.0
+    return 0.39 * words / sentences + 11.8 * syllable_total / words - 15.59
+
+
+def gunning_fog(words, sentences, complex_words):
+    if not words or not sentences:
+        return 0.0
+    return 0.4 * (words / sentences + 100 * complex_words / words)
+
+
+def _row(level, section, sentence, text, words, sentences, syllable_total, complex_words):
+    return {
+        "level": level,
+        "section": section,
+        "sentence": sentence,
+        "text": text,
+        "words": words,
+        "sentences": sentences,
+        "syllables": syllable_total,
+        "complex_words": complex_words,
+        "flesch_kincaid_grade": round(flesch_kincaid(words, sentences, syllable_total), 2),
+        "gunning_fog": round(gunning_fog(words, sentences, complex_words), 2),
+    }
+
+
+def analyze_rows(text):
+    """Return score rows for the document, each clause and each sentence."""
+    from nltk.tokenize import sent_tokenize
+
+    rows = []
+    doc_totals = [0, 0, 0, 0]
+    for s_idx, clause in enumerate(split_clauses(text)):
+        sec_totals = [0, 0, 0, 0]
+        for n_idx, sentence in enumerate(sent_tokenize(_NUMBERING.sub("", clause, count=1))):
+            words, syll, complex_words = sentence_counts(sentence)
+            if not words:
+                continue
+            rows.append(_row("sentence", s_idx, n_idx, sentence, words, 1, syll, complex_words))
+            for totals in (sec_totals, doc_totals):
+                totals[0] += words
+                totals[1] += 1
+                totals[2] += syll
+                totals[3] += complex_words
+        if sec_totals[0]:
+            rows.append(_row("section", s_idx, None, clause, *sec_totals))
+    rows.append(_row("document", None, None, None, *doc_totals))
+    return rows
+
+
+def analyze(text):
+    """Return a DataFrame with one ``document`` row, one row per ``section`` and per ``sentence``."""
+    import pandas as pd
+    return pd.DataFrame(analyze_rows(text))
+
+
+def analyze_many(texts, max_workers=None):
+    """Analyze several documents in parallel processes; rows gain a ``doc`` column."""
+    import pandas as pd
+
+    texts = list(texts)
+    if not texts:
+        return pd.DataFrame()
+    if len(texts) == 1:
+        results = [analyze_rows(texts[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(analyze_rows, texts))
+    frames = [pd.DataFrame(rows).assign(doc=i) for i, rows in enumerate(results)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def document_scores(df):
+    """Return the document-level scores from an :func:`analyze` frame as a dict."""
+    row = df[df["level"] == "document"].iloc[0]
+    return {"Flesch-Kincaid Grade": row["flesch_kincaid_grade"], "Gunning Fog Index": row["gunning_fog"]}
+
+
+def worst_sections(df, n=5, by="flesch_kincaid_grade"):
+    """Return the ``n`` hardest clauses by ``by``."""
+    return df[df["level"] == "section"].nlargest(n, by)
@@ -0,0 +1,159 @@
+"""Process-wide registry of NLP models shared by every page and session.
+
+Models are loaded lazily on first :func:`get_model` call, kept until they sit
+idle for ``CLS_MODEL_IDLE_TIMEOUT`` seconds, and report how long they took to
+load and how much resident memory loading them added. Generation models load
+through the backend chosen for them in :mod:`cls_core.backends`.
+"""
+import gc
+import os
+import threading
+import time
+
+from cls_core import backends
+
+IDLE_TIMEOUT = float(os.getenv("CLS_MODEL_IDLE_TIMEOUT", "1800"))  # seconds, 0 disables unloading
+REAP_INTERVAL = 60
+
+
+def current_rss():
+    """Return this process's resident set size in bytes (0 if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return 0
+
+
+def pipeline_loader(model_id, task="text2text-generation", backend=None):
+    backend = backend or backends.backend_for(model_id)
+
+    def load():
+        return backends.load(model_id, task, backend)
+    load.backend = backend
+    return load
+
+
+def spacy_loader(name):
+    def load():
+        import spacy
+        return spacy.load(name)
+    return load
+
+
+class _Entry:
+    def __init__(self, loader):
+        self.loader = loader
+        self.backend = getattr(loader, "backend", None)
+        self.lock = threading.Lock()
+        self.model = None
+        self.loaded_at = None
+        self.last_used = None
+        self.load_seconds = None
+        self.rss_bytes = None
+        self.loads = 0
+
+
+class ModelRegistry:
+    def __init__(self, idle_timeout=IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def register(self, name, loader, replace=False):
+        """Register ``loader`` (a zero-argument callable) under ``name``.
+
+        An existing registration is kept unless ``replace`` is set, which
+        also drops the model it loaded (benchmarks swap in stand-in models).
+        """
+        with self._lock:
+            if replace or name not in self._entries:
+                self._entries[name] = _Entry(loader)
+
+    def get(self, name):
+        """Return the model called ``name``, loading it if it is not resident."""
+        with self._lock:
+            if name not in self._entries:
+                raise KeyError(f"Unknown model: {name}")
+            entry = self._entries[name]
+        with entry.lock:
+            if entry.model is None:
+                rss_before = current_rss()
+                start = time.perf_counter()
+                entry.model = entry.loader()
+                entry.load_seconds = time.perf_counter() - start
+                entry.rss_bytes = max(current_rss() - rss_before, 0)
+                entry.loaded_at = time.time()
+                entry.loads += 1
+                self._start_reaper()
+            entry.last_used = time.time()
+            return entry.model
+
+    def unload(self, name):
+        """Drop the registry's reference to ``name`` so its memory can be reclaimed."""
+        entry = self._entries[name]
+        with entry.lock:
+            if entry.model is None:
+                return False
+            entry.model = None
+            entry.loaded_at = None
+        gc.collect()
+        return True
+
+    def unload_idle(self, now=None):
+        """Unload every model unused for longer than the idle timeout."""
+        if self.idle_timeout <= 0:
+            return []
+        now = now or time.time()
+        idle = [name for name, e in list(self._entries.items())
+                if e.model is not None and now - e.last_used > self.idle_timeout]
+        return [name for name in idle if self.unload(name)]
+
+    def stats(self):
+        """Return one row per registered model with load time and resident memory."""
+        rows = []
+        for name, e in list(self._entries.items()):
+            rows.append({
+                "model": name,
+                "backend": e.backend,
+                "loaded": e.model is not None,
+                "load_seconds": round(e.load_seconds, 2) if e.load_seconds is not None else None,
+                "rss_mb": round(e.rss_bytes / 2**20, 1) if e.rss_bytes is not None else None,
+                "idle_seconds": round(time.time() - e.last_used) if e.last_used else None,
+                "loads": e.loads,
+            })
+        return rows
+
+    def _start_reaper(self):
+        if self.idle_timeout <= 0 or self._reaper is not None:
+            return
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_forever, name="model-reaper", daemon=True)
+                self._reaper.start()
+
+    def _reap_forever(self):
+        while True:
+            time.sleep(min(REAP_INTERVAL, self.idle_timeout))
+            self.unload_idle()
+
+
+registry = ModelRegistry()
+registry.register("tuner007/pegasus_paraphrase", pipeline_loader("tuner007/pegasus_paraphrase"))
+registry.register("t5-base", pipeline_loader("t5-base"))
+registry.register("google/flan-t5-base", pipeline_loader("google/flan-t5-base"))
+registry.register("en_core_web_sm", spacy_loader("en_core_web_sm"))
+
+
+def get_model(name):
+    return registry.get(name)
+
+
+def model_stats():
+    return registry.stats()
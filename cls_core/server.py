@@ -0,0 +1,225 @@
+"""Local inference server: one copy of each model, dynamically batched across sessions.
+
+Run it with ``python -m cls_core serve`` and point the app at it with
+``CLS_INFERENCE_URL=http://127.0.0.1:8765``.
+
+Each (model, generation params) pair has a batcher thread. A batch is
+dispatched once ``CLS_SERVE_MAX_BATCH`` sentences are waiting, or
+``CLS_SERVE_MAX_WAIT_MS`` after its oldest sentence arrived, whichever
+comes first. Batches are filled round-robin across users, so one user's
+200-page upload can't hold everyone else's single paragraph behind it.
+A user is the request's ``owner`` key: ``user:<id>`` for an account, or
+a per-session key for each anonymous visitor (see ``auth.owner_key``).
+When a model's queue holds ``CLS_SERVE_MAX_QUEUE`` sentences, or a user
+has ``CLS_SERVE_MAX_PER_USER`` waiting, new requests are refused with
+503 and ``Retry-After`` rather than queued without bound.
+
+Endpoints: ``POST /generate`` ``{"model", "texts", "params", "owner"}`` ->
+``{"outputs"}``; ``GET /stats``; ``GET /health``.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cls_core import generation
+from cls_core.batching import simplify_batched
+from cls_core.registry import get_model, model_stats
+
+MAX_BATCH = int(os.getenv("CLS_SERVE_MAX_BATCH", "32"))
+MAX_WAIT = float(os.getenv("CLS_SERVE_MAX_WAIT_MS", "20")) / 1000
+MAX_QUEUE = int(os.getenv("CLS_SERVE_MAX_QUEUE", "2048"))
+MAX_PER_USER = int(os.getenv("CLS_SERVE_MAX_PER_USER", "512"))
+REQUEST_TIMEOUT = float(os.getenv("CLS_INFERENCE_TIMEOUT", "300"))
+
+
+class Overloaded(Exception):
+    pass
+
+
+class _Item:
+    __slots__ = ("text", "future", "enqueued")
+
+    def __init__(self, text):
+        self.text = text
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class Batcher:
+    """Queues sentences for one (model, params) pair and runs them in micro-batches."""
+
+    def __init__(self, model_name, params, model_lock):
+        self.model_name = model_name
+        self.params = params
+        self.model_lock = model_lock
+        self.queues = OrderedDict()  # user -> deque of _Item, in round-robin order
+        self.size = 0
+        self.cond = threading.Condition()
+        self.batch_sizes = {}  # power-of-two bucket -> batches
+        self.waits = deque(maxlen=2000)  # seconds from enqueue to dispatch
+        self.processed = 0
+        self.rejected = 0
+        threading.Thread(target=self._loop, name=f"batcher-{model_name}", daemon=True).start()
+
+    def submit(self, user, texts):
+        items = [_Item(t) for t in texts]
+        with self.cond:
+            queue = self.queues.get(user)
+            waiting = len(queue) if queue else 0
+            if self.size + len(items) > MAX_QUEUE or waiting + len(items) > MAX_PER_USER:
+                self.rejected += len(items)
+                raise Overloaded()
+            if queue is None:
+                queue = self.queues[user] = deque()
+            queue.extend(items)
+            self.size += len(items)
+            self.cond.notify()
+        return [item.future for item in items]
+
+    def _take_batch(self):
+        with self.cond:
+            while not self.size:
+                self.cond.wait()
+            deadline = min(q[0].enqueued for q in self.queues.values()) + MAX_WAIT
+            while self.size < MAX_BATCH and time.perf_counter() < deadline:
+                self.cond.wait(deadline - time.perf_counter())
+            batch = []
+            while len(batch) < MAX_BATCH and self.queues:
+                # One sentence per user per turn; a served user moves to the back.
+                user, queue = next(iter(self.queues.items()))
+                batch.append(queue.popleft())
+                if queue:
+                    self.queues.move_to_end(user)
+                else:
+                    del self.queues[user]
+            self.size -= len(batch)
+            return batch
+
+    def _loop(self):
+        while True:
+            batch = self._take_batch()
+            now = time.perf_counter()
+            self.waits.extend(now - item.enqueued for item in batch)
+            bucket = 1 << (len(batch) - 1).bit_length()
+            self.batch_sizes[bucket] = self.batch_sizes.get(bucket, 0) + 1
+            try:
+                with self.model_lock:
+                    outputs = simplify_batched(get_model(self.model_name), [i.text for i in batch], **self.params)
+            except Exception as e:
+                for item in batch:
+                    item.future.set_exception(e)
+                continue
+            self.processed += len(batch)
+            for item, output in zip(batch, outputs):
+                item.future.set_result(output)
+
+    def stats(self):
+        waits = sorted(self.waits)
+        return {
+            "model": self.model_name,
+            "params": self.params,
+            "queue_depth": self.size,
+            "users_waiting": len(self.queues),
+            "processed": self.processed,
+            "rejected": self.rejected,
+            "batch_size_histogram": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+            "wait_ms_p50": round(waits[len(waits) // 2] * 1000, 1) if waits else None,
+            "wait_ms_p99": round(waits[max(int(len(waits) * 0.99) - 1, 0)] * 1000, 1) if waits else None,
+        }
+
+
+class InferenceService:
+    def __init__(self):
+        self._batchers = {}
+        self._model_locks = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def batcher(self, model_name, params):
+        key = (model_name, json.dumps(params, sort_keys=True))
+        with self._lock:
+            if key not in self._batchers:
+                # Different params share the model object, so they take turns on it.
+                lock = self._model_locks.setdefault(model_name, threading.Lock())
+                self._batchers[key] = Batcher(model_name, params, lock)
+            return self._batchers[key]
+
+    def generate(self, model_name, texts, params, owner=None):
+        get_model(model_name)  # unknown models fail here, before anything is queued
+        futures = self.batcher(model_name, params).submit(owner, texts)
+        return [f.result(timeout=REQUEST_TIMEOUT) for f in futures]
+
+    def stats(self):
+        with self._lock:
+            batchers = list(self._batchers.values())
+        return {
+            "uptime_s": round(time.time() - self.started),
+            "queue_depth": sum(b.size for b in batchers),
+            "batchers": [b.stats() for b in batchers],
+            "models": model_stats(),
+            "generation": generation.stats(),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send(self, code, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"ok": True})
+        elif self.path == "/stats":
+            self._send(200, self.service.stats())
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            outputs = self.service.generate(body["model"], list(body["texts"]), body.get("params") or {},
+                                            body.get("owner"))
+        except Overloaded:
+            self._send(503, {"error": "queue full"}, {"Retry-After": "1"})
+        except KeyError as e:
+            self._send(404, {"error": f"unknown model or missing field: {e}"})
+        except (ValueError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+        else:
+            self._send(200, {"outputs": outputs})
+
+    def log_message(self, format, *args):
+        pass  # one line per request would swamp the console under load
+
+
+def serve(host="127.0.0.1", port=8765, preload=()):
+    service = InferenceService()
+    for name in preload:
+        get_model(name)
+    handler = type("Handler", (_Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"Inference server listening on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
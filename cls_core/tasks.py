@@ -0,0 +1,58 @@
+"""A small dependency graph of callables run concurrently on a thread pool.
+
+Each task starts as soon as the tasks it depends on have finished, and
+:meth:`TaskGraph.run` yields results in completion order, so a page can
+render each stage the moment it is ready. Tasks run in a copy of the
+caller's context, so telemetry spans inside them count toward the caller's
+active trace.
+"""
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class TaskGraph:
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._tasks = {}  # name -> (fn, deps), in insertion order
+
+    def add(self, name, fn, *deps):
+        """Add ``fn``; it is called with the results of ``deps`` as positional arguments."""
+        missing = [d for d in deps if d not in self._tasks]
+        if missing:
+            raise KeyError(f"Task {name!r} depends on unknown task(s): {', '.join(missing)}")
+        self._tasks[name] = (fn, deps)
+        return self
+
+    def run(self):
+        """Yield ``(name, result, seconds)`` as each task finishes.
+
+        ``seconds`` is the task's own wall time. If a task raises, tasks not
+        yet started are abandoned and the exception propagates.
+        """
+        results, running = {}, {}
+        pending = dict(self._tasks)
+        context = contextvars.copy_context()
+
+        def timed(fn, args):
+            start = time.perf_counter()
+            result = fn(*args)
+            return result, time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cls-task") as pool:
+            try:
+                while pending or running:
+                    for name, (fn, deps) in list(pending.items()):
+                        if all(d in results for d in deps):
+                            args = [results[d] for d in deps]
+                            running[pool.submit(context.copy().run, timed, fn, args)] = name
+                            del pending[name]
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        result, seconds = future.result()
+                        results[name] = result
+                        yield name, result, seconds
+            finally:
+                for future in running:
+                    future.cancel()
@@ -0,0 +1,242 @@
+"""Per-request timing and token telemetry with pre-aggregated hourly rollups.
+
+Pages wrap each request in :func:`trace`. Shared code adds stage timings and
+counters to the active trace through :func:`span` and :func:`add`, and these
+are no-ops when no trace is active. Finished traces are buffered in memory and
+written in batches to the append-only ``request_log`` table. The same write
+folds them into ``request_rollup_hourly``, so the dashboard reads a few
+hundred rollup rows however large the log grows.
+"""
+import atexit
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from cls_core.db import get_conn
+
+FLUSH_EVERY = int(os.getenv("CLS_TELEMETRY_FLUSH_EVERY", "50"))
+FLUSH_INTERVAL = float(os.getenv("CLS_TELEMETRY_FLUSH_INTERVAL", "5"))
+
+COUNTERS = ["extraction_ms", "tokenization_ms", "model_ms", "total_ms",
+            "tokens_in", "tokens_out", "cache_hits", "cache_misses"]
+
+_current = contextvars.ContextVar("cls_trace", default=None)
+_buffer = []
+_buffer_lock = threading.Lock()
+_flusher = None
+
+
+class Trace:
+    def __init__(self, page, user_id=None, owner=None):
+        self.page = page
+        self.user_id = user_id
+        # Who the request's model work is queued for (see auth.owner_key). Without one, an anonymous
+        # request gets a key of its own rather than sharing None with every other anonymous request.
+        if owner is None:
+            owner = f"user:{user_id}" if user_id is not None else f"request:{uuid.uuid4().hex}"
+        self.owner = owner
+        self.ts = datetime.utcnow()
+        self.ok = True
+        self.values = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()  # stages of one request may run on several threads
+
+    def add(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                self.values[name] += value
+
+
+@contextmanager
+def trace(page, user_id=None, owner=None, **values):
+    """Record one request from ``page`` for ``owner``; ``values`` seeds counters measured beforehand."""
+    t = Trace(page, user_id, owner)
+    t.add(**values)
+    token = _current.set(t)
+    start = time.perf_counter()
+    try:
+        yield t
+    except Exception:
+        t.ok = False
+        raise
+    finally:
+        t.add(total_ms=(time.perf_counter() - start) * 1000)
+        _current.reset(token)
+        record(t)
+
+
+def add(**values):
+    """Add to counters of the active trace, if any."""
+    t = _current.get()
+    if t is not None:
+        t.add(**values)
+
+
+def current_owner():
+    """Return the owner key of the active trace, if any."""
+    t = _current.get()
+    return t.owner if t is not None else None
+
+
+@contextmanager
+def span(stage):
+    """Time a block and add it to ``<stage>_ms`` on the active trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(**{f"{stage}_ms": (time.perf_counter() - start) * 1000})
+
+
+def record(t):
+    with _buffer_lock:
+        _buffer.append(t)
+        full = len(_buffer) >= FLUSH_EVERY
+    _start_flusher()
+    if full:
+        flush()
+
+
+def flush():
+    """Write buffered traces to the log and fold them into the hourly rollups."""
+    with _buffer_lock:
+        batch = _buffer[:]
+        del _buffer[:]
+    if not batch:
+        return 0
+    rollups = defaultdict(lambda: dict.fromkeys(["requests", "errors", "max_total_ms"] + COUNTERS, 0))
+    users = set()
+    for t in batch:
+        hour = t.ts.strftime("%Y-%m-%d %H:00")
+        r = rollups[(hour, t.page)]
+        r["requests"] += 1
+        r["errors"] += not t.ok
+        r["max_total_ms"] = max(r["max_total_ms"], t.values["total_ms"])
+        for name in COUNTERS:
+            r[name] += t.values[name]
+        if t.user_id is not None:
+            users.add((hour, t.user_id))
+
+    conn = get_conn()
+    conn.executemany(
+        f"INSERT INTO request_log (ts, page, user_id, {', '.join(COUNTERS)}, ok) "
+        f"VALUES (?, ?, ?, {', '.join('?' * len(COUNTERS))}, ?)",
+        [(t.ts.isoformat(), t.page, t.user_id, *[t.values[c] for c in COUNTERS], int(t.ok)) for t in batch],
+    )
+    sums = ["requests", "errors"] + COUNTERS
+    conn.executemany(
+        f"INSERT INTO request_rollup_hourly (hour, page, {', '.join(sums)}, max_total_ms) "
+        f"VALUES (?, ?, {', '.join('?' * len(sums))}, ?) "
+        f"ON CONFLICT (hour, page) DO UPDATE SET "
+        + ", ".join(f"{c} = {c} + excluded.{c}" for c in sums)
+        + ", max_total_ms = MAX(max_total_ms, excluded.max_total_ms)",
+        [(hour, page, *[r[c] for c in sums], r["max_total_ms"]) for (hour, page), r in rollups.items()],
+    )
+    conn.executemany("INSERT OR IGNORE INTO request_users_hourly (hour, user_id) VALUES (?, ?)", sorted(users))
+    conn.commit()
+    conn.close()
+    return len(batch)
+
+
+def daily_rollups(days=10, page=None):
+    """Return one row per day (oldest first) aggregated from the hourly rollups."""
+    since = (datetime.utcnow() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    where, params = "WHERE hour >= ?", [since]
+    if page is not None:
+        where += " AND page = ?"
+        params.append(page)
+    conn = get_conn()
+    rows = conn.execute(f"""
+        SELECT substr(hour, 1, 10) AS day, SUM(requests), SUM(errors), SUM(total_ms), SUM(model_ms),
+               SUM(tokens_in), SUM(tokens_out), SUM(cache_hits), SUM(cache_misses)
+        FROM request_rollup_hourly {where}
+        GROUP BY day ORDER BY day
+    """, params).fetchall()
+    active = dict(conn.execute(
+        "SELECT substr(hour, 1, 10) AS day, COUNT(DISTINCT user_id) FROM request_users_hourly "
+        "WHERE hour >= ? GROUP BY day", [since]).fetchall())
+    conn.close()
+    return [{
+        "Date": day,
+        "Simplifications": requests,
+        "Users Active": active.get(day, 0),
+        "Avg Processing Time (s)": round(total_ms / requests / 1000, 2) if requests else 0.0,
+        "Avg Model Time (s)": round(model_ms / requests / 1000, 2) if requests else 0.0,
+        "Tokens In": tokens_in,
+        "Tokens Out": tokens_out,
+        "Cache Hits": hits,
+        "Cache Misses": misses,
+        "Errors": errors,
+    } for day, requests, errors, total_ms, model_ms, tokens_in, tokens_out, hits, misses in rows]
+
+
+def hourly_rollups(hours=24, page=None):
+    """Return one row per hour (oldest first) for the last ``hours`` hours."""
+    since = (datetime.utcnow() - timedelta(hours=hours - 1)).strftime("%Y-%m-%d %H:00")
+    where, params = "WHERE hour >= ?", [since]
+    if page is not None:
+        where += " AND page = ?"
+        params.append(page)
+    conn = get_conn()
+    rows = conn.execute(f"""
+        SELECT hour, SUM(requests), SUM(total_ms), MAX(max_total_ms)
+        FROM request_rollup_hourly {where}
+        GROUP BY hour ORDER BY hour
+    """, params).fetchall()
+    conn.close()
+    return [{
+        "Hour": hour,
+        "Requests": requests,
+        "Avg Processing Time (s)": round(total_ms / requests / 1000, 2) if requests else 0.0,
+        "Max Processing Time (s)": round(max_ms / 1000, 2),
+    } for hour, requests, total_ms, max_ms in rows]
+
+
+def summary(days=30, page=None):
+    """Return request count, average latency, error rate and cache hit rate over ``days``."""
+    since = (datetime.utcnow() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    where, params = "WHERE hour >= ?", [since]
+    if page is not None:
+        where += " AND page = ?"
+        params.append(page)
+    conn = get_conn()
+    requests, errors, total_ms, tokens, hits, misses = conn.execute(f"""
+        SELECT COALESCE(SUM(requests), 0), COALESCE(SUM(errors), 0), COALESCE(SUM(total_ms), 0),
+               COALESCE(SUM(tokens_in + tokens_out), 0), COALESCE(SUM(cache_hits), 0), COALESCE(SUM(cache_misses), 0)
+        FROM request_rollup_hourly {where}
+    """, params).fetchone()
+    conn.close()
+    return {
+        "requests": requests,
+        "avg_seconds": total_ms / requests / 1000 if requests else 0.0,
+        "error_rate": errors / requests if requests else 0.0,
+        "cache_hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "tokens": tokens,
+    }
+
+
+def _start_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _buffer_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_forever, name="telemetry-flush", daemon=True)
+            _flusher.start()
+
+
+def _flush_forever():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush()
+        except sqlite3.Error:
+            pass  # a locked or unavailable database must not kill the flusher
+
+
+atexit.register(flush)
@@ -0,0 +1,173 @@
+"""Per-sentence simplification history of uploaded contracts, for diff-aware re-runs.
+
+A document is identified by (owner, name, mode). The owner is the key
+background jobs use too, so an anonymous visitor's revisions are only ever
+diffed against uploads from the same session. The name is the upload's
+file name without its version suffix (:func:`document_name`), so
+``MSA_v2.docx`` and ``MSA_v3.docx`` are revisions of one document ``MSA.docx``;
+the page also lets the user pick the document explicitly. Each upload stores a
+new version: its file name, sentences and their simplifications. When a
+revision is uploaded, its sentences are diffed against the latest stored
+version with ``difflib``. Unchanged sentences reuse their stored output, and
+only changed or inserted sentences go to the model, so a redline costs time
+in proportion to the edit.
+
+Each version also records a fingerprint of the model settings that made it
+(see ``pipeline.paraphrase_fingerprint``). After a model, backend or
+``CLS_GEN_*`` change the fingerprint differs, and nothing is reused.
+"""
+import difflib
+import os
+import re
+from datetime import datetime
+
+from cls_core.db import get_conn
+
+KEEP_VERSIONS = int(os.getenv("CLS_DOC_VERSIONS_KEEP", "5"))
+
+_WHITESPACE = re.compile(r"\s+")
+# Trailing revision markers: "_v3", " version 2", "-rev4", " (1)", "_draft", "_final", "_redline", ...
+_VERSION_SUFFIX = re.compile(
+    r"(?:[\s_.-]+|(?=\())(?:\(\d+\)"
+    r"|\(?(?:v(?:ersion)?[\s_.-]*\d+|rev(?:ision)?[\s_.-]*\d+|draft\d*|final|redline|clean|copy)\)?)$",
+    re.IGNORECASE,
+)
+
+
+def _key(sentence):
+    # Re-extraction can reflow whitespace; that alone is not an edit.
+    return _WHITESPACE.sub(" ", sentence).strip()
+
+
+def document_name(file_name):
+    """Return ``file_name`` without revision markers: ``MSA_v3 (final).docx`` -> ``MSA.docx``."""
+    stem, ext = os.path.splitext(file_name)
+    while True:
+        stripped = _VERSION_SUFFIX.sub("", stem)
+        if stripped == stem or not stripped:
+            break
+        stem = stripped
+    return stem + ext
+
+
+def documents(owner, mode="paraphrase"):
+    """Return ``owner``'s stored documents, most recently revised first."""
+    conn = get_conn()
+    rows = conn.execute("""
+        SELECT d.name, v.version, v.file_name, v.created_at
+        FROM documents d JOIN document_versions v ON v.document_id = d.id
+        WHERE d.owner=? AND d.mode=? AND v.version = (
+            SELECT MAX(version) FROM document_versions WHERE document_id = d.id)
+        ORDER BY v.created_at DESC
+    """, (owner, mode)).fetchall()
+    conn.close()
+    return [dict(zip(("name", "version", "file_name", "created_at"), row)) for row in rows]
+
+
+def _document_id(conn, owner, name, mode):
+    row = conn.execute("SELECT id FROM documents WHERE owner=? AND name=? AND mode=?", (owner, name, mode)).fetchone()
+    if row:
+        return row[0]
+    cur = conn.execute("INSERT INTO documents (owner, name, mode, created_at) VALUES (?, ?, ?, ?)",
+                       (owner, name, mode, datetime.utcnow().isoformat()))
+    return cur.lastrowid
+
+
+def latest_version(document_id):
+    """Return ``(version, [(source, output), ...])`` of the newest version, or ``(0, [])``."""
+    conn = get_conn()
+    row = conn.execute("SELECT MAX(version) FROM document_versions WHERE document_id=?", (document_id,)).fetchone()
+    version = row[0] or 0
+    rows = conn.execute("SELECT source, output FROM version_sentences WHERE document_id=? AND version=? ORDER BY idx",
+                        (document_id, version)).fetchall()
+    conn.close()
+    return version, rows
+
+
+def diff(old_sentences, new_sentences):
+    """Return ``(reuse, changed)``: ``reuse`` maps new index -> old index, ``changed`` lists new indices to run."""
+    matcher = difflib.SequenceMatcher(None, [_key(s) for s in old_sentences], [_key(s) for s in new_sentences],
+                                      autojunk=False)
+    reuse, changed = {}, []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            reuse.update(zip(range(j1, j2), range(i1, i2)))
+        elif tag in ("replace", "insert"):
+            changed.extend(range(j1, j2))
+    return reuse, changed
+
+
+def resimplify(owner, name, sentences, simplify, mode="paraphrase", file_name=None, fingerprint=None):
+    """Simplify a new version of ``owner``'s ``name``, running ``simplify`` only on sentences that changed.
+
+    ``simplify`` takes a list of sentences and returns their outputs in
+    order. ``file_name`` is the uploaded file (default ``name``) and
+    ``fingerprint`` identifies the settings ``simplify`` runs with; if the
+    previous version was made under another fingerprint, every sentence is
+    simplified again. Returns ``(outputs, report)``; ``report`` has the
+    document id, new version number, counts of reused, simplified and deleted
+    sentences, the indices of the changed sentences and whether the previous
+    outputs were ``stale``.
+    """
+    sentences = list(sentences)
+    conn = get_conn()
+    document_id = _document_id(conn, owner, name, mode)
+    conn.commit()
+    conn.close()
+
+    previous, rows = latest_version(document_id)
+    reuse, changed = diff([source for source, _ in rows], sentences)
+    stale = bool(previous) and _fingerprint(document_id, previous) != fingerprint
+    todo = list(range(len(sentences))) if stale else changed
+    outputs = [rows[reuse[i]][1] if i in reuse else "" for i in range(len(sentences))]
+    if todo:
+        for i, output in zip(todo, simplify([sentences[i] for i in todo])):
+            outputs[i] = output
+    reused = len(sentences) - len(todo)
+
+    version = previous + 1
+    now = datetime.utcnow().isoformat()
+    conn = get_conn()
+    conn.execute("INSERT INTO document_versions (document_id, version, sentences, reused, simplified, created_at, "
+                 "file_name, fingerprint) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                 (document_id, version, len(sentences), reused, len(todo), now, file_name or name, fingerprint))
+    conn.executemany("INSERT INTO version_sentences (document_id, version, idx, source, output) VALUES (?, ?, ?, ?, ?)",
+                     [(document_id, version, i, s, o) for i, (s, o) in enumerate(zip(sentences, outputs))])
+    conn.execute("DELETE FROM document_versions WHERE document_id=? AND version<=?",
+                 (document_id, version - KEEP_VERSIONS))
+    conn.commit()
+    conn.close()
+
+    return outputs, {
+        "document_id": document_id,
+        "version": version,
+        "previous_version": previous,
+        "sentences": len(sentences),
+        "reused": reused,
+        "simplified": len(todo),
+        "deleted": len(rows) - len(reuse),
+        "changed": changed,
+        "stale": stale,
+    }
+
+
+def _fingerprint(document_id, version):
+    conn = get_conn()
+    row = conn.execute("SELECT fingerprint FROM document_versions WHERE document_id=? AND version=?",
+                       (document_id, version)).fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def history(owner, name, mode="paraphrase"):
+    """Return the stored versions of a document, newest first."""
+    conn = get_conn()
+    rows = conn.execute("""
+        SELECT v.version, v.file_name, v.sentences, v.reused, v.simplified, v.created_at
+        FROM document_versions v JOIN documents d ON d.id = v.document_id
+        WHERE d.owner=? AND d.name=? AND d.mode=?
+        ORDER BY v.version DESC
+    """, (owner, name, mode)).fetchall()
+    conn.close()
+    return [dict(zip(("version", "file_name", "sentences", "reused", "simplified", "created_at"), row))
+            for row in rows]
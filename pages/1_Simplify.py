@@ -1,17 +1,25 @@
 import streamlit as st
-from transformers import pipeline
 import re
-import docx2txt
-import PyPDF2
-from nltk.tokenize import sent_tokenize
-import nltk
-
-# ====== DOWNLOAD NLTK DATA ======
-nltk.download('punkt', quiet=True)
+import time
+from cls_core import auth
+from cls_core import bootstrap
+from cls_core import bulk
+from cls_core import dedup
+from cls_core import glossary as glossary_store
+from cls_core import jobs
+from cls_core import telemetry
+from cls_core import versions
+from cls_core.extract import SUPPORTED_TYPES, extract_text, file_type
+from cls_core.pipeline import (PARAPHRASE_MODEL, iter_simplified, paraphrase_fingerprint, simplify_batch,
+                               simplify_plan, simplify_sentences, split_sentences)
 
 # ====== PAGE CONFIG ======
 st.set_page_config(page_title="Simplify Contracts", layout="wide")
 
+# ====== NLP RESOURCES (loaded once per process, not on every rerun) ======
+for problem in bootstrap.ensure():
+    st.error(problem)
+
 # ====== STYLING ======
 st.markdown("""
     <style>
@@ -29,49 +37,140 @@ st.markdown("""
 st.markdown("<div class='header'>Contract Simplification Tool</div>", unsafe_allow_html=True)
 st.markdown("<div class='subtext'>Upload or paste your legal text to simplify it intelligently using AI.</div>", unsafe_allow_html=True)
 
-# ====== LOAD SIMPLIFICATION MODEL ======
-@st.cache_resource
-def load_model():
-    return pipeline("text2text-generation", model="tuner007/pegasus_paraphrase")
-model = load_model()
-
 # ====== FILE UPLOAD ======
 st.markdown("<div class='card'>", unsafe_allow_html=True)
-uploaded_file = st.file_uploader("Upload contract (PDF, DOCX, TXT)", type=["pdf", "docx", "txt"])
+uploaded_file = st.file_uploader("Upload contract (PDF, DOCX, TXT)", type=SUPPORTED_TYPES)
 
 text = ""
+extraction_ms = 0.0
 if uploaded_file:
-    ext = uploaded_file.name.split(".")[-1].lower()
-    if ext == "pdf":
-        pdf = PyPDF2.PdfReader(uploaded_file)
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    elif ext == "docx":
-        text = docx2txt.process(uploaded_file)
-    elif ext == "txt":
-        text = uploaded_file.read().decode("utf-8")
+    ext = file_type(uploaded_file.name)
+    started = time.perf_counter()
+    text = extract_text(uploaded_file)
+    extraction_ms = (time.perf_counter() - started) * 1000
     st.success(f"Extracted text from {ext.upper()} file successfully.")
 else:
     text = st.text_area("Or paste your contract text here:", height=200)
 st.markdown("</div>", unsafe_allow_html=True)
 
-# ====== SIMPLIFICATION FUNCTION ======
-def simplify_text(long_text):
-    """Split long text into sentences, simplify each part, and join them."""
-    sentences = sent_tokenize(long_text)
-    simplified_sentences = []
-    for sent in sentences:
-        result = model(sent, max_length=100, num_return_sequences=1)[0]['generated_text']
-        simplified_sentences.append(result)
-    return " ".join(simplified_sentences)
+# ====== SIMPLIFICATION (cls_core.pipeline, model loaded on first use) ======
+def show_glossary(text):
+    """List admin-curated glossary terms that appear in the contract."""
+    terms = glossary_store.match_terms(text)
+    if terms:
+        st.markdown("### Legal Glossary")
+        for term, meaning in terms.items():
+            st.write(f"**{term}** → {meaning}")
+
+
+def show_dedup_report(plan):
+    report = plan.report()
+    if report["calls_saved"]:
+        st.caption(f"Repeated text: {report['calls_saved']} of {report['sentences']} sentences reused another "
+                   f"sentence's simplification ({report['exact_duplicates']} exact, "
+                   f"{report['near_duplicates']} near duplicates).")
+
+jobs.register_handler("paraphrase", PARAPHRASE_MODEL, simplify_sentences)
+user_id = st.session_state["user"]["id"] if "user" in st.session_state else None
+# Jobs, revision history and queued model work belong to the account, or for anonymous visitors to this
+# browser session only.
+owner = auth.owner_key(st.session_state)
 
 # ====== SIMPLIFY BUTTON ======
+background = st.checkbox("Run in the background (recommended for long contracts)")
+incremental = st.checkbox("Show each sentence as soon as it is simplified", value=True, disabled=background)
+track_revisions = bool(uploaded_file) and st.checkbox(
+    "Treat this upload as a revision: only simplify sentences changed since the previous revision",
+    disabled=background)
+if track_revisions:
+    # Redlines usually arrive under a new file name (MSA_v3.docx after MSA_v2.docx), so offer the stored documents.
+    guess = versions.document_name(uploaded_file.name)
+    stored_documents = {d["name"]: d for d in versions.documents(owner)}
+    options = list(stored_documents) if guess in stored_documents else [guess] + list(stored_documents)
+    document = st.selectbox(
+        "Revision of", options, index=options.index(guess),
+        format_func=lambda n: (f"{n} (last: {stored_documents[n]['file_name'] or n}, "
+                               f"revision {stored_documents[n]['version']})" if n in stored_documents
+                               else f"{n} (new document)"))
+
 if st.button("Simplify Contract"):
     if not text.strip():
         st.warning("Please upload or paste contract text first.")
+    elif background:
+        name = uploaded_file.name if uploaded_file else "Pasted text"
+        job_id = jobs.submit(owner, name, "paraphrase", split_sentences(text), user_id)
+        st.success(f"Queued job #{job_id}. You can leave or refresh this page; progress is listed below.")
+    elif track_revisions:
+        with st.spinner("Comparing with the previous revision..."), \
+                telemetry.trace("simplify", user_id, owner, extraction_ms=extraction_ms):
+            sentences = split_sentences(text)
+            outputs, revision = versions.resimplify(owner, document, sentences, simplify_sentences,
+                                                    file_name=uploaded_file.name, fingerprint=paraphrase_fingerprint())
+        if revision["stale"]:
+            st.info(f"Revision {revision['version']} of {document}: the model or its settings changed since "
+                    f"revision {revision['previous_version']}, so all {revision['simplified']} sentences were "
+                    f"simplified again.")
+        elif revision["previous_version"]:
+            st.info(f"Revision {revision['version']} of {document}: simplified {revision['simplified']} "
+                    f"changed or new sentences and reused {revision['reused']} from revision "
+                    f"{revision['previous_version']} ({revision['deleted']} removed).")
+        simplified_text = " ".join(outputs)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Original Text")
+            st.markdown(text)
+        with col2:
+            st.subheader("Simplified Text")
+            st.markdown(simplified_text)
+
+        if revision["previous_version"] and revision["changed"]:
+            with st.expander(f"Changed since revision {revision['previous_version']}"):
+                for i in revision["changed"]:
+                    left, right = st.columns(2)
+                    left.markdown(sentences[i])
+                    right.markdown(outputs[i])
+
+        show_glossary(text)
+
+        st.download_button(
+            label="Download Simplified Text",
+            data=simplified_text,
+            file_name="simplified_contract.txt",
+            mime="text/plain"
+        )
+    elif incremental:
+        sentences = split_sentences(text)
+        plan = dedup.plan(sentences)
+        progress = st.progress(0.0, text=f"Simplified 0/{len(sentences)} sentences")
+        col1, col2 = st.columns(2)
+        col1.subheader("Original Text")
+        col2.subheader("Simplified Text")
+
+        simplified_sentences = []
+        with telemetry.trace("simplify", user_id, owner, extraction_ms=extraction_ms):
+            for source, output in iter_simplified(plan):
+                left, right = st.columns(2)
+                left.markdown(source)
+                right.markdown(output)
+                simplified_sentences.append(output)
+                done = len(simplified_sentences)
+                progress.progress(done / len(sentences), text=f"Simplified {done}/{len(sentences)} sentences")
+
+        show_dedup_report(plan)
+        show_glossary(text)
+
+        st.download_button(
+            label="Download Simplified Text",
+            data=" ".join(simplified_sentences),
+            file_name="simplified_contract.txt",
+            mime="text/plain"
+        )
     else:
-        with st.spinner("Simplifying contract text..."):
-            simplified_text = simplify_text(text)
+        with st.spinner("Simplifying contract text..."), \
+                telemetry.trace("simplify", user_id, owner, extraction_ms=extraction_ms):
+            plan = dedup.plan(split_sentences(text))
+            simplified_text = " ".join(simplify_plan(plan))
 
         # ====== DISPLAY OUTPUT ======
         col1, col2 = st.columns(2)
@@ -82,9 +181,64 @@ if st.button("Simplify Contract"):
             st.subheader("Simplified Text")
             st.markdown(simplified_text)
 
+        show_dedup_report(plan)
+        show_glossary(text)
+
         st.download_button(
             label="Download Simplified Text",
             data=simplified_text,
             file_name="simplified_contract.txt",
             mime="text/plain"
         )
+
+# ====== BULK SIMPLIFICATION ======
+with st.expander("📦 Bulk mode: simplify many contracts at once"):
+    bulk_files = st.file_uploader("Upload contracts or a ZIP archive", type=SUPPORTED_TYPES + ["zip"],
+                                  accept_multiple_files=True, key="bulk_files")
+    if st.button("Simplify All") and bulk_files:
+        try:
+            with st.spinner("Extracting and simplifying contracts..."), \
+                    telemetry.trace("bulk", user_id, owner) as request:
+                with telemetry.span("extraction"):
+                    extracted = bulk.extract_all(bulk.expand_uploads(bulk_files))
+                results = bulk.simplify_documents(extracted, simplify_batch)
+        except bulk.UploadTooLarge as e:
+            st.error(str(e))
+        else:
+            st.success(f"Simplified {len(results)} files in {request.values['total_ms'] / 1000:.1f}s.")
+            st.dataframe(
+                [{"File": r["name"], "Sentences": r["sentences"], "Model Calls Saved": r["calls_saved"],
+                  "Extraction (s)": round(r["extraction_s"], 2),
+                  "Inference (s)": round(r["inference_s"], 2), "Error": r["error"] or ""} for r in results],
+                use_container_width=True, hide_index=True
+            )
+            st.download_button(
+                label="Download Simplified Contracts (ZIP)",
+                data=bulk.build_archive(results),
+                file_name="simplified_contracts.zip",
+                mime="application/zip"
+            )
+
+# ====== BACKGROUND JOBS ======
+user_jobs = jobs.list_jobs(owner)
+if user_jobs:
+    st.markdown("### Background Jobs")
+    st.button("🔄 Refresh Status")
+    for job in user_jobs:
+        c1, c2, c3 = st.columns([3, 2, 1])
+        c1.markdown(f"**#{job['id']} {job['name']}** ({job['status']})")
+        c2.progress(job["done"] / job["total"] if job["total"] else 1.0, text=f"{job['done']}/{job['total']} sentences")
+        if job["status"] in (jobs.QUEUED, jobs.RUNNING):
+            if c3.button("Cancel", key=f"cancel_{job['id']}"):
+                jobs.cancel(job["id"], owner)
+                st.rerun()
+        elif job["status"] == jobs.DONE:
+            c3.download_button(
+                label="Download",
+                data=" ".join(output for _, output in jobs.job_results(job["id"], owner)),
+                file_name=f"simplified_contract_{job['id']}.txt",
+                mime="text/plain",
+                key=f"download_{job['id']}"
+            )
+        elif job["status"] == jobs.FAILED:
+            c3.error(job["error"] or "Failed")
@@ -1,14 +1,22 @@
 import streamlit as st
-from transformers import pipeline
-import re
-import docx2txt
-import PyPDF2
+import hashlib
+import time
+from cls_core import auth
+from cls_core import bootstrap
+from cls_core import glossary as glossary_store
+from cls_core import pipeline
+from cls_core import telemetry
+from cls_core.extract import SUPPORTED_TYPES, extract_text, file_type
 
 # ==============================
 # 🔧 PAGE CONFIGURATION
 # ==============================
 st.set_page_config(page_title="Multi-Level Simplification", layout="wide")
 
+# NLTK data is loaded once per process, not on every rerun
+for problem in bootstrap.ensure():
+    st.error(problem)
+
 # ==============================
 # 🎨 GLOBAL STYLING
 # ==============================
@@ -28,32 +36,20 @@ st.markdown("""
 st.markdown("<div class='header'>Multi-Level Simplification</div>", unsafe_allow_html=True)
 st.markdown("<div class='subtext'>Choose your simplification level and get smart explanations for complex terms.</div>", unsafe_allow_html=True)
 
-# ==============================
-# 🧠 LOAD MODEL
-# ==============================
-@st.cache_resource
-def load_model():
-    return pipeline("text2text-generation", model="google/flan-t5-base")
-model = load_model()
-
 # ==============================
 # 📁 FILE UPLOAD OR TEXT AREA
 # ==============================
 st.markdown("<div class='card'>", unsafe_allow_html=True)
-uploaded_file = st.file_uploader("📄 Upload Contract (PDF, DOCX, or TXT)", type=["pdf", "docx", "txt"])
+uploaded_file = st.file_uploader("📄 Upload Contract (PDF, DOCX, or TXT)", type=SUPPORTED_TYPES)
 
 text = ""
+extraction_ms = 0.0
 if uploaded_file:
-    file_type = uploaded_file.name.split(".")[-1].lower()
-    if file_type == "pdf":
-        pdf_reader = PyPDF2.PdfReader(uploaded_file)
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-    elif file_type == "docx":
-        text = docx2txt.process(uploaded_file)
-    elif file_type == "txt":
-        text = uploaded_file.read().decode("utf-8")
-    st.success(f"✅ Extracted text from {file_type.upper()} file successfully.")
+    ext = file_type(uploaded_file.name)
+    started = time.perf_counter()
+    text = extract_text(uploaded_file)
+    extraction_ms = (time.perf_counter() - started) * 1000
+    st.success(f"✅ Extracted text from {ext.upper()} file successfully.")
 else:
     text = st.text_area("Or paste your legal text here:", height=200)
 st.markdown("</div>", unsafe_allow_html=True)
@@ -61,77 +57,110 @@ st.markdown("</div>", unsafe_allow_html=True)
 # ==============================
 # 🎚️ SIMPLIFICATION LEVEL
 # ==============================
-level_map = {0: "Basic", 1: "Intermediate", 2: "Advanced"}
+level_map = dict(enumerate(pipeline.LEVELS))
 level_value = st.slider("Simplification Level", 0, 2, 1)
 level = level_map[level_value]
 st.info(f"Selected Mode: **{level} Simplification**")
+other_levels = st.checkbox("Also prepare the other levels, so moving the slider afterwards is instant", value=True)
 
 # ==============================
-# ⚙️ SIMPLIFICATION FUNCTION
+# ⚙️ SIMPLIFICATION + GLOSSARY TASK GRAPH (cls_core.pipeline.multilevel_graph)
 # ==============================
-def simplify_text(text, mode):
-    prompt = {
-        "Basic": f"Simplify this legal text slightly for clarity:\n{text}",
-        "Intermediate": f"Rephrase this legal contract in simpler, non-technical English:\n{text}",
-        "Advanced": f"Rewrite this legal document in very simple, everyday language:\n{text}"
-    }[mode]
-    return model(prompt, max_length=500, do_sample=False)[0]["generated_text"]
+# Simplification and the glossary run side by side. The selected level is
+# simplified first; the other levels (if asked for) follow in one batched
+# pass, so moving the slider afterwards just shows another stored result.
 
-# ==============================
-# ⚙️ GLOSSARY GENERATION FUNCTION
-# ==============================
-@st.cache_data
-def generate_dynamic_glossary(text):
-    # Extract unique capitalized words or key terms that look legal
-    terms = list(set(re.findall(r"\b[A-Z][a-z]+\b", text)))
-    important_terms = [t for t in terms if len(t) > 6 or t.lower() in ["agreement", "employer", "employee", "termination", "liability"]]
-    glossary = {}
-    for term in important_terms[:10]:  # Limit to top 10 for speed
-        explanation = model(f"Explain the legal term '{term}' in one short sentence.", max_length=50)[0]['generated_text']
-        glossary[term] = explanation
-    return glossary
+# Results of the last run, reused for as long as the text stays the same
+text_key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+stored = st.session_state.get("multilevel_results")
+if stored and stored["text_key"] != text_key:
+    stored = None
 
 # ==============================
 # 🚀 SIMPLIFICATION + GLOSSARY
 # ==============================
-if st.button("Simplify Text"):
-    if not text.strip():
-        st.warning("Please upload or paste text first.")
-    else:
-        with st.spinner(f"Simplifying using {level} mode..."):
-            simplified = simplify_text(text, level)
-            glossary = generate_dynamic_glossary(text)
+run = st.button("Simplify Text")
+if run and not text.strip():
+    st.warning("Please upload or paste text first.")
+elif run or stored:
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("### Original Text (Highlighted)")
+        original_slot = st.empty()
+        original_slot.markdown(text)
+    with col2:
+        st.markdown("### Simplified Text")
+        simplified_slot = st.empty()
+        simplified_slot.info(f"Simplifying using {level} mode...")
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.subheader("Dynamic Legal Glossary")
+    glossary_slot = st.empty()
+    glossary_slot.info("Finding legal terms...")
+    st.markdown("</div>", unsafe_allow_html=True)
 
+    def show_glossary(glossary):
         # Highlight glossary terms in original text
-        highlighted = text
-        for term in glossary:
-            highlighted = re.sub(rf"\b({term})\b", r"**\1**", highlighted, flags=re.IGNORECASE)
-
-        # Display results
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("### Original Text (Highlighted)")
-            st.markdown(highlighted)
-        with col2:
-            st.markdown("### Simplified Text")
-            st.markdown(simplified)
-
-        # Show Glossary
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-        st.subheader("Dynamic Legal Glossary")
-        for t, m in glossary.items():
-            st.write(f"**{t.capitalize()}** → {m}")
-        st.markdown("</div>", unsafe_allow_html=True)
-
-        st.download_button("⬇ Download Simplified Text", data=simplified, file_name="simplified_contract.txt", mime="text/plain")
+        original_slot.markdown(glossary_store.highlight(text, glossary))
+        glossary_slot.markdown("\n\n".join(f"**{t.capitalize()}** → {m}" for t, m in glossary.items())
+                               or "No legal terms found.")
+
+    if run:
+        user_id = st.session_state["user"]["id"] if "user" in st.session_state else None
+        timings = [("Extraction", extraction_ms / 1000)] if uploaded_file else []
+        started = time.perf_counter()
+        levels, costs = {}, []
+        with telemetry.trace("multilevel", user_id, auth.owner_key(st.session_state), extraction_ms=extraction_ms):
+            for stage, result, seconds in pipeline.multilevel_graph(text, level, other_levels).run():
+                timings.append((stage, seconds))
+                if stage in ("Simplification", "Other levels"):
+                    levels.update(result[0])
+                    costs.append(result[1])
+                    if stage == "Simplification":
+                        simplified_slot.markdown(levels[level])
+                elif stage == "Term extraction":
+                    curated, terms = result
+                    glossary_slot.info(f"Defining {len(curated) + len(terms)} legal terms...")
+                elif stage == "Glossary definitions":
+                    glossary = result
+                    show_glossary(glossary)
+        stored = {"text_key": text_key, "levels": levels, "glossary": glossary, "costs": costs,
+                  "timings": timings, "wall": time.perf_counter() - started}
+        st.session_state["multilevel_results"] = stored
+    else:
+        if level in stored["levels"]:
+            simplified_slot.markdown(stored["levels"][level])
+        else:
+            simplified_slot.info(f"{level} was not prepared; press **Simplify Text** to generate it.")
+        show_glossary(stored["glossary"])
+        st.caption("Showing stored results for this text; press **Simplify Text** to run again.")
+
+    for cost in stored["costs"]:
+        names = ", ".join(cost["levels"])
+        if not cost["prompts"]:
+            st.caption(f"{names}: served from the cache.")
+        elif len(cost["levels"]) > 1:
+            st.caption(f"{names}: {cost['prompts']} prompts in {cost['batches']} batches ({cost['seconds']:.2f}s); "
+                       f"separate runs per level would have needed {cost['separate_batches']} batches.")
+        else:
+            st.caption(f"{names}: {cost['prompts']} prompts in {cost['batches']} batches ({cost['seconds']:.2f}s).")
+
+    with st.expander(f"Stage timings ({stored['wall']:.2f}s wall time)"):
+        st.table([{"Stage": stage, "Seconds": round(seconds, 3)} for stage, seconds in stored["timings"]])
+
+    if level in stored["levels"]:
+        st.download_button("⬇ Download Simplified Text", data=stored["levels"][level],
+                           file_name="simplified_contract.txt", mime="text/plain")
 
 # ==============================
 # 📊 METRICS
 # ==============================
 st.markdown("---")
 st.markdown("### Key Performance Metrics")
+stats = telemetry.summary(days=30, page="multilevel")
+today = telemetry.daily_rollups(days=1)
+active_today = today[-1]["Users Active"] if today else 0
 c1, c2, c3, c4 = st.columns(4)
 c1.markdown("<div class='metric-box'>3<small>Simplification Levels</small></div>", unsafe_allow_html=True)
-c2.markdown("<div class='metric-box'>85%<small>Accuracy in Simplification</small></div>", unsafe_allow_html=True)
-c3.markdown("<div class='metric-box'>1000+<small>Concurrent Users</small></div>", unsafe_allow_html=True)
-c4.markdown("<div class='metric-box'>90%<small>User Satisfaction</small></div>", unsafe_allow_html=True)
+c2.markdown(f"<div class='metric-box'>{stats['avg_seconds']:.1f}s<small>Avg Response Time (30d)</small></div>", unsafe_allow_html=True)
+c3.markdown(f"<div class='metric-box'>{active_today}<small>Active Users Today</small></div>", unsafe_allow_html=True)
+c4.markdown(f"<div class='metric-box'>{stats['cache_hit_rate']:.0%}<small>Cache Hit Rate (30d)</small></div>", unsafe_allow_html=True)
@@ -1,8 +1,13 @@
 import streamlit as st
 import pandas as pd
 import time
-import random
-from datetime import datetime, timedelta
+from cls_core import bootstrap
+from cls_core import generation
+from cls_core import glossary as glossary_store
+from cls_core import inference
+from cls_core import telemetry
+from cls_core.cache import get_cache
+from cls_core.registry import model_stats
 
 # =============================
 # PAGE CONFIG & STYLE
@@ -37,29 +42,25 @@ st.markdown("<div class='header'> Admin Dashboard</div>", unsafe_allow_html=True
 st.markdown("<div class='subtext'>Monitor simplification activity, performance metrics, and glossary management.</div>", unsafe_allow_html=True)
 
 # =============================
-# SIMULATED DATA (Replace with DB later)
+# REQUEST TELEMETRY (pre-aggregated hourly rollups)
 # =============================
-dates = [datetime.now() - timedelta(days=i) for i in range(10)]
-activity_data = {
-    "Date": [d.strftime("%Y-%m-%d") for d in dates],
-    "Simplifications": [random.randint(5, 25) for _ in dates],
-    "Users Active": [random.randint(3, 15) for _ in dates],
-    "Avg Processing Time (s)": [round(random.uniform(1.5, 4.5), 2) for _ in dates]
-}
-df_activity = pd.DataFrame(activity_data)
+activity_columns = ["Date", "Simplifications", "Users Active", "Avg Processing Time (s)", "Avg Model Time (s)",
+                    "Tokens In", "Tokens Out", "Cache Hits", "Cache Misses", "Errors"]
+df_activity = pd.DataFrame(telemetry.daily_rollups(days=10), columns=activity_columns)
+totals = telemetry.summary(days=10)
 
 # =============================
 # METRIC CARDS
 # =============================
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.markdown("<div class='metric-card'><div class='metric-value'>324</div><div class='metric-label'>Total Simplifications</div></div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-card'><div class='metric-value'>{totals['requests']}</div><div class='metric-label'>Total Simplifications (10d)</div></div>", unsafe_allow_html=True)
 with col2:
-    st.markdown("<div class='metric-card'><div class='metric-value'>82%</div><div class='metric-label'>User Satisfaction</div></div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-card'><div class='metric-value'>{totals['cache_hit_rate']:.0%}</div><div class='metric-label'>Cache Hit Rate</div></div>", unsafe_allow_html=True)
 with col3:
-    st.markdown("<div class='metric-card'><div class='metric-value'>2.3s</div><div class='metric-label'>Avg Response Time</div></div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-card'><div class='metric-value'>{totals['avg_seconds']:.1f}s</div><div class='metric-label'>Avg Response Time</div></div>", unsafe_allow_html=True)
 with col4:
-    st.markdown("<div class='metric-card'><div class='metric-value'>98%</div><div class='metric-label'>System Uptime</div></div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-card'><div class='metric-value'>{1 - totals['error_rate']:.0%}</div><div class='metric-label'>Success Rate</div></div>", unsafe_allow_html=True)
 
 # =============================
 # ACTIVITY OVER TIME
@@ -67,12 +68,72 @@ with col4:
 st.markdown("### Simplification Requests Over Time")
 st.line_chart(df_activity.set_index("Date")[["Simplifications", "Users Active"]])
 
+st.markdown("### Last 24 Hours")
+df_hourly = pd.DataFrame(telemetry.hourly_rollups(hours=24),
+                         columns=["Hour", "Requests", "Avg Processing Time (s)", "Max Processing Time (s)"])
+st.bar_chart(df_hourly.set_index("Hour")[["Requests"]])
+
 # =============================
 # PERFORMANCE STATS TABLE
 # =============================
 st.markdown("### System Performance Logs")
 st.dataframe(df_activity, use_container_width=True)
 
+# =============================
+# SIMPLIFICATION CACHE
+# =============================
+st.markdown("### Simplification Cache")
+cache_stats = get_cache().stats()
+k1, k2, k3, k4 = st.columns(4)
+k1.metric("Cached Outputs", cache_stats["entries"])
+k2.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+k3.metric("Hits / Misses", f"{cache_stats['hits']} / {cache_stats['misses']}")
+k4.metric("Evictions", cache_stats["evictions"])
+if st.button("🗑 Clear Cache"):
+    get_cache().clear()
+    st.rerun()
+
+# =============================
+# LOADED MODELS
+# =============================
+st.markdown("### Loaded Models")
+st.dataframe(pd.DataFrame(model_stats()), use_container_width=True)
+
+startup = bootstrap.stats()
+s1, s2, s3 = st.columns(3)
+s1.metric("Cold Start (NLTK)", f"{startup['cold_start_ms']} ms" if startup["cold_start_ms"] is not None else "—")
+s2.metric("Warm Rerun (avg)", f"{startup['avg_warm_ms']} ms" if startup["avg_warm_ms"] is not None else "—")
+s3.metric("Page Reruns Served Warm", startup["warm_calls"])
+if startup["missing"] and not startup["ready"]:
+    st.warning(f"NLTK data not found: {', '.join(startup['missing'])}")
+
+gen = generation.stats()
+g1, g2, g3 = st.columns(3)
+g1.metric("Decode Steps Saved", f"{gen['decode_steps_saved']:,}")
+g2.metric("Skipped as Already Plain", gen["skipped"], help=f"Flesch-Kincaid grade at or below {gen['skip_grade']}")
+g3.metric("Generated Rows", gen["rows"])
+
+# =============================
+# INFERENCE SERVER (when CLS_INFERENCE_URL is set)
+# =============================
+if inference.INFERENCE_URL:
+    st.markdown("### Inference Server")
+    try:
+        server = inference.server_stats()
+    except Exception as e:
+        st.error(f"Inference server at {inference.INFERENCE_URL} is unreachable: {e}")
+    else:
+        i1, i2, i3 = st.columns(3)
+        i1.metric("Queue Depth", server["queue_depth"])
+        i2.metric("Sentences Served", sum(b["processed"] for b in server["batchers"]))
+        i3.metric("Rejected (queue full)", sum(b["rejected"] for b in server["batchers"]))
+        if "generation" in server:
+            st.caption(f"Decode steps saved on the server: {server['generation']['decode_steps_saved']:,}")
+        for b in server["batchers"]:
+            st.markdown(f"**{b['model']}** · wait p50 {b['wait_ms_p50']} ms · p99 {b['wait_ms_p99']} ms")
+            st.bar_chart(pd.DataFrame({"Batches": b["batch_size_histogram"]}))
+        st.dataframe(pd.DataFrame(server["models"]), use_container_width=True)
+
 # =============================
 # GLOSSARY MANAGEMENT SECTION
 # =============================
@@ -83,10 +144,10 @@ default_glossary = {
     "Termination": "Ending the contract before it naturally expires."
 }
 
-if "glossary" not in st.session_state:
-    st.session_state.glossary = default_glossary
-
-glossary = st.session_state.glossary
+glossary = glossary_store.list_terms("admin")
+if not glossary:
+    glossary_store.save(default_glossary, source="admin")
+    glossary = glossary_store.list_terms("admin")
 
 colA, colB = st.columns(2)
 with colA:
@@ -96,16 +157,36 @@ with colB:
 
 if st.button("➕ Add Term"):
     if new_term and new_meaning:
-        glossary[new_term.capitalize()] = new_meaning
+        glossary_store.save({new_term.capitalize(): new_meaning}, source="admin")
         st.success(f"Added term: {new_term.capitalize()}")
         time.sleep(0.5)
         st.rerun()
     else:
         st.warning("Please fill both fields before adding a term.")
 
-st.write("#### Current Glossary")
-for term, meaning in glossary.items():
-    st.markdown(f"**{term}** → {meaning}")
+colC, colD = st.columns(2)
+with colC:
+    doomed = st.selectbox("Remove a term:", [""] + [term for term, _, _ in glossary])
+    if st.button("🗑 Remove Term") and doomed:
+        glossary_store.delete(doomed)
+        st.rerun()
+with colD:
+    glossary_csv = st.file_uploader("Import terms (CSV with term,definition columns)", type=["csv"])
+    if glossary_csv and st.button("⬆ Import CSV"):
+        count = glossary_store.import_csv(glossary_csv)
+        st.success(f"Imported {count} terms.")
+        time.sleep(0.5)
+        st.rerun()
+
+st.write(f"#### Current Glossary ({len(glossary)} terms)")
+st.dataframe(pd.DataFrame([(t, m) for t, m, _ in glossary], columns=["Term", "Definition"]),
+             use_container_width=True, hide_index=True)
+st.download_button(
+    label="⬇ Export Glossary (CSV)",
+    data=glossary_store.export_csv("admin"),
+    file_name="legal_glossary.csv",
+    mime="text/csv"
+)
 
 # =============================
 # EXPORT OPTION
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the app and cache databases at a scratch directory before cls_core.db is imported,
+# so nothing a test starts (including job threads and the telemetry flush at exit) writes to real ones.
+_scratch = tempfile.mkdtemp(prefix="cls-tests-")
+os.environ["CLS_DB_PATH"] = os.path.join(_scratch, "app.db")
+os.environ["CLS_CACHE_PATH"] = os.path.join(_scratch, "cache.db")
+
+
+@pytest.fixture
+def app_db(tmp_path, monkeypatch):
+    """A fresh, migrated application database for one test."""
+    from cls_core import db
+
+    pool = db.ConnectionPool(str(tmp_path / "app.db"))
+    monkeypatch.setattr(db, "pool", pool)
+    monkeypatch.setattr(db, "_migrated", False)
+    yield
+    pool.close_all()
@@ -0,0 +1,38 @@
+import io
+import zipfile
+
+import pytest
+
+from cls_core import bulk
+
+
+class Upload(io.BytesIO):
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+
+def zipped(members):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return Upload("contracts.zip", out.getvalue())
+
+
+def test_member_names_cannot_escape_the_archive():
+    upload = zipped({"../../etc/evil.txt": "a", "/abs/b.txt": "b", "C:\\docs\\c.txt": "c", "nda/d.txt": "d"})
+    names = [name for name, _ in bulk.expand_uploads([upload])]
+    assert names == ["etc/evil.txt", "abs/b.txt", "docs/c.txt", "nda/d.txt"]
+
+    results = [{"name": "../../x.txt", "error": None, "simplified": "", "sentences": 0, "calls_saved": 0,
+                "extraction_s": 0, "split_s": 0, "inference_s": 0}]
+    with zipfile.ZipFile(io.BytesIO(bulk.build_archive(results))) as archive:
+        assert archive.namelist() == ["x.simplified.txt", "timing_report.csv"]
+
+
+def test_refuses_archives_that_unpack_past_the_limit():
+    upload = zipped({"a.txt": "x" * 600, "b.txt": "x" * 600})
+    with pytest.raises(bulk.UploadTooLarge):
+        bulk.expand_uploads([upload], max_unzipped=1000)
+    assert len(bulk.expand_uploads([zipped({"a.txt": "x" * 600})], max_unzipped=1000)) == 1
@@ -0,0 +1,26 @@
+from cls_core.cache import SimplificationCache
+
+
+def fill(cache, n, size=10, start=0):
+    for i in range(start, start + n):
+        cache.put_many("m", "paraphrase", {}, [(f"text {i}", "x" * size)])
+
+
+def test_running_totals_follow_inserts_updates_and_evictions(tmp_path):
+    cache = SimplificationCache(str(tmp_path / "cache.db"), max_entries=3, max_bytes=0)
+    fill(cache, 5)
+    cache.put_many("m", "paraphrase", {}, [("text 4", "y" * 25)])
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (3, 45, 2)
+    assert cache.get_many("m", "paraphrase", {}, ["text 0", "text 1"]) == {}
+
+
+def test_evicts_least_recently_used_past_the_byte_bound(tmp_path):
+    cache = SimplificationCache(str(tmp_path / "cache.db"), max_entries=100, max_bytes=40)
+    fill(cache, 4)
+    cache.get_many("m", "paraphrase", {}, ["text 0"])  # now the most recently used
+    fill(cache, 2, start=4)
+    stats = cache.stats()
+    assert stats["bytes"] <= 40
+    assert set(cache.get_many("m", "paraphrase", {}, [f"text {i}" for i in range(6)])) == {
+        "text 0", "text 3", "text 4", "text 5"}
@@ -0,0 +1,21 @@
+from cls_core.chunking import split_clauses
+
+CONTRACT = """1. FEES AND PAYMENT
+1.1 The Customer shall pay the Supplier the sum of 5,000 within
+30 days of receipt of a valid invoice.
+1.2 Late payments bear interest at 4% a year above base rate from
+2 business days after the due date.
+(a) Interest accrues daily.
+2. TERM
+Section 3 applies."""
+
+
+def test_splits_on_heading_numbering():
+    clauses = split_clauses(CONTRACT)
+    assert [c.split()[0] for c in clauses] == ["1.", "1.1", "1.2", "(a)", "2.", "Section"]
+
+
+def test_wrapped_lines_starting_with_a_number_stay_in_their_clause():
+    clauses = split_clauses(CONTRACT)
+    assert "within\n30 days of receipt" in clauses[1]
+    assert "from\n2 business days" in clauses[2]
@@ -0,0 +1,36 @@
+from cls_core import dedup
+
+CLAUSE = ("The parties agree that the liquidated damages payable by the Contractor for each day of delay "
+          "shall not exceed 10,000 in aggregate and that such sum is not a penalty but a genuine pre-estimate "
+          "of the loss which the Employer is likely to suffer as a result of any delay in completion of the "
+          "Works beyond the agreed completion date set out in the schedule to this agreement.")
+
+
+def merged(a, b, threshold=0.9):
+    plan = dedup.plan([a, b], threshold=threshold)
+    return plan.index[0] == plan.index[1]
+
+
+def test_default_merges_exact_repeats_only():
+    reworded = CLAUSE.replace("set out in", "stated in")
+    plan = dedup.plan([CLAUSE, "4.2 " + CLAUSE, reworded])
+    assert dedup.THRESHOLD == 1
+    assert plan.index[0] == plan.index[1]
+    assert plan.index[2] != plan.index[0]
+
+
+def test_near_duplicates_still_merge_below_one():
+    assert merged(CLAUSE, CLAUSE.replace("set out in", "stated in"))
+
+
+def test_negation_keeps_sentences_apart():
+    assert not merged(CLAUSE, CLAUSE.replace("shall not exceed", "shall exceed"))
+    assert not merged(CLAUSE, CLAUSE.replace("is not a penalty", "is a penalty"))
+
+
+def test_different_numbers_keep_sentences_apart():
+    assert not merged(CLAUSE, CLAUSE.replace("10,000", "90,000"))
+
+
+def test_different_parties_keep_sentences_apart():
+    assert not merged(CLAUSE, CLAUSE.replace("by the Contractor", "by the Employer"))
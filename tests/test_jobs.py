@@ -0,0 +1,29 @@
+import threading
+import time
+
+from cls_core import jobs
+
+
+def test_another_owners_job_is_invisible_and_cannot_be_cancelled(app_db):
+    release = threading.Event()
+
+    def handler(chunks):
+        release.wait(5)
+        return [c.upper() for c in chunks]
+
+    jobs.register_handler("test-upper", "test-model", handler)
+    job_id = jobs.submit("session:a", "nda.txt", "test-upper", ["one", "two"])
+
+    assert jobs.list_jobs("session:b") == []
+    assert jobs.get_job(job_id, "session:b") is None
+    jobs.cancel(job_id, "session:b")
+    assert jobs.get_job(job_id, "session:a")["status"] in (jobs.QUEUED, jobs.RUNNING)
+
+    release.set()
+    for _ in range(100):
+        if jobs.get_job(job_id, "session:a")["status"] == jobs.DONE:
+            break
+        time.sleep(0.05)
+    assert jobs.job_results(job_id, "session:a") == [("one", "ONE"), ("two", "TWO")]
+    assert jobs.job_results(job_id, "session:b") == []
+    assert [j["id"] for j in jobs.list_jobs("session:a")] == [job_id]
@@ -0,0 +1,30 @@
+from cls_core import generation, pipeline
+
+
+class Tokenizer:
+    def __call__(self, texts, add_special_tokens=True):
+        return {"input_ids": [t.split() for t in texts]}
+
+
+def test_level_with_its_own_beam_width_still_comes_back(monkeypatch):
+    calls = []
+
+    def generate(model_name, texts, **params):
+        calls.append(params.get("num_beams", 1))
+        return [f"plain: {t}" for t in texts]
+
+    monkeypatch.setattr(pipeline, "generate", generate)
+    monkeypatch.setattr(pipeline, "get_tokenizer", lambda name: Tokenizer())
+    monkeypatch.setattr(generation, "grade", lambda text: 20.0)  # nothing is plain enough to skip
+    monkeypatch.setattr(generation, "BEAMS", {"Advanced": 4})
+    monkeypatch.setattr(pipeline, "cached_generate_modes",
+                        lambda model, params, texts_by_mode, generate, cache=None, plain=None: {
+                            mode: generate([(mode, t) for t in texts]) for mode, texts in texts_by_mode.items()})
+
+    chunks = ["The Licensee shall indemnify the Licensor.", "Notwithstanding clause 4, fees are payable."]
+    for levels in (["Intermediate", "Advanced"], pipeline.LEVELS):
+        texts, report = pipeline.simplify_chunks_levels(chunks, levels)
+        assert list(texts) == list(levels)
+        assert report["levels"] == list(levels)
+        assert report["prompts"] == len(chunks) * len(levels)
+    assert sorted(set(calls)) == [1, 4]
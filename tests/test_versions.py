@@ -0,0 +1,39 @@
+from cls_core import versions
+
+V1 = ["The Supplier shall deliver the Goods.", "Payment is due within 30 days.",
+      "This Agreement is governed by English law."]
+V2 = ["The Supplier shall deliver the Goods.", "Payment is due within 45 days.",
+      "This Agreement is governed by English law.", "Either party may terminate on notice."]
+
+
+def upper(sentences, calls):
+    calls.append(list(sentences))
+    return [s.upper() for s in sentences]
+
+
+def test_diff_reuses_equal_sentences_and_lists_the_rest():
+    reuse, changed = versions.diff(V1, [V1[0], "  Payment is due within\n30 days. "] + V2[1:])
+    assert reuse == {0: 0, 1: 1, 3: 2}
+    assert changed == [2, 4]
+
+
+def test_redline_under_a_new_file_name_only_reruns_the_changes(app_db):
+    calls = []
+    name = versions.document_name("MSA_v2.docx")
+    versions.resimplify("user:1", name, V1, lambda s: upper(s, calls), file_name="MSA_v2.docx", fingerprint="a")
+    outputs, report = versions.resimplify("user:1", versions.document_name("MSA_v3 (final).docx"), V2,
+                                          lambda s: upper(s, calls), file_name="MSA_v3 (final).docx",
+                                          fingerprint="a")
+    assert outputs == [s.upper() for s in V2]
+    assert calls[-1] == [V2[1], V2[3]]
+    assert (report["previous_version"], report["reused"], report["simplified"], report["deleted"]) == (1, 2, 2, 1)
+    assert [d["file_name"] for d in versions.documents("user:1")] == ["MSA_v3 (final).docx"]
+    assert versions.documents("session:other") == []
+
+
+def test_outputs_made_under_other_settings_are_not_reused(app_db):
+    calls = []
+    versions.resimplify("user:1", "NDA.pdf", V1, lambda s: upper(s, calls), fingerprint="old")
+    _, report = versions.resimplify("user:1", "NDA.pdf", V1, lambda s: upper(s, calls), fingerprint="new")
+    assert report["stale"] and report["reused"] == 0
+    assert calls[-1] == V1